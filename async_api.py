@@ -1,22 +1,273 @@
-from fastapi import FastAPI, Depends, HTTPException
-from typing import List
+from fastapi import FastAPI, Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordRequestForm
+from typing import List, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from models import Skill, SkillBase
-from async_connection import get_async_session, init_async_db
+from models import (
+    Project, Skill, Team, TeamMemberLink, User, UserSkillLink, SkillLevel, Task,
+    ProjectTeamLink, UserBase, SkillBase, TeamBase, ProjectBase, TeamRole, ProjectSkillLink,
+    UserResponse, TeamResponse, ProjectResponse, UserCreate, Token, PasswordChange, ProjectMatch
+)
+from async_connection import async_engine, get_async_session, init_async_db
+from db_config import pool_stats
+from auth import (
+    authenticate_user_async, create_access_token, get_current_active_user_async,
+    get_password_hash, verify_password, ACCESS_TOKEN_EXPIRE_MINUTES
+)
+from auth_cache import auth_user_cache
+from eager_loading import load_options
+from matching import find_matching_teams, project_matcher
+from pagination import (
+    Page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor,
+    keyset_paginate, build_page
+)
+from password_hashing import password_hasher
 
-app = FastAPI(title="Async API Example")
-
-@app.on_event("startup")
-async def startup():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     await init_async_db()
+    yield
+    password_hasher.shutdown()
+
+app = FastAPI(title="Async API Example", lifespan=lifespan)
+
+async def get_or_404(session: AsyncSession, model, object_id: int, detail: str):
+    """Асинхронно получает объект по первичному ключу или возвращает 404"""
+    obj = await session.get(model, object_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail=detail)
+    return obj
+
+@app.get("/async/")
+async def hello():
+    return "Hello, World!"
+
+# Аутентификация
+@app.post("/async/register", response_model=User)
+async def register_user(user_create: UserCreate, session: AsyncSession = Depends(get_async_session)):
+    """Асинхронно регистрирует пользователя"""
+    result = await session.execute(select(User).where(User.username == user_create.username))
+    if result.scalars().first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+
+    result = await session.execute(select(User).where(User.email == user_create.email))
+    if result.scalars().first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+    db_user = User(
+        username=user_create.username,
+        email=user_create.email,
+        full_name=user_create.full_name,
+        hashed_password=await get_password_hash(user_create.password),
+        bio=user_create.bio,
+        years_of_experience=user_create.years_of_experience
+    )
+    session.add(db_user)
+    await session.commit()
+    await session.refresh(db_user)
+    return db_user
+
+@app.post("/async/token", response_model=Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно выдает JWT токен"""
+    user = await authenticate_user_async(session, form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token = create_access_token(
+        data={"sub": user.username}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@app.get("/async/users/me", response_model=User)
+async def read_users_me(current_user: User = Depends(get_current_active_user_async)):
+    return current_user
+
+@app.put("/async/users/me/password")
+async def change_password(
+    password_change: PasswordChange,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно меняет пароль текущего пользователя"""
+    if not await verify_password(password_change.current_password, current_user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect current password"
+        )
+
+    current_user.hashed_password = await get_password_hash(password_change.new_password)
+    session.add(current_user)
+    await session.commit()
+    auth_user_cache.invalidate(current_user.username)
+    return {"message": "Password updated successfully"}
+
+@app.get("/async/metrics/auth-cache")
+async def get_auth_cache_metrics():
+    return auth_user_cache.stats()
+
+@app.get("/async/metrics/db-pool")
+async def get_db_pool_metrics():
+    return pool_stats(async_engine)
+
+# Пользователи
+@app.get("/async/users/", response_model=Page[User])
+async def get_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно получает страницу пользователей"""
+    result = await session.execute(keyset_paginate(select(User), User.id, cursor, limit))
+    return build_page(result.scalars().all(), limit)
+
+@app.get("/async/users/search/", response_model=Page[User])
+async def search_users_by_skills(
+    skill_ids: List[int] = Query(None),
+    min_level: Optional[SkillLevel] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно ищет пользователей по навыкам"""
+    query = select(User)
+    if skill_ids:
+        matching_users = select(UserSkillLink.user_id).where(UserSkillLink.skill_id.in_(skill_ids))
+        if min_level:
+            matching_users = matching_users.where(UserSkillLink.level >= min_level)
+        query = query.where(User.id.in_(matching_users))
+
+    result = await session.execute(keyset_paginate(query, User.id, cursor, limit))
+    return build_page(result.scalars().all(), limit)
+
+@app.get("/async/users/{user_id}", response_model=UserResponse)
+async def get_user(
+    user_id: int,
+    current_user: User = Depends(get_current_active_user_async),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно получает пользователя вместе с навыками, командами и задачами"""
+    result = await session.execute(
+        select(User).where(User.id == user_id).options(*load_options(User, "get_user"))
+    )
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+@app.post("/async/users/", response_model=User)
+async def create_user(user: User, session: AsyncSession = Depends(get_async_session)):
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+@app.patch("/async/users/{user_id}", response_model=User)
+async def update_user(user_id: int, user: UserBase, session: AsyncSession = Depends(get_async_session)):
+    db_user = await get_or_404(session, User, user_id, "User not found")
+    previous_username = db_user.username
+    for key, value in user.model_dump(exclude_unset=True).items():
+        setattr(db_user, key, value)
+
+    session.add(db_user)
+    await session.commit()
+    await session.refresh(db_user)
+    auth_user_cache.invalidate(previous_username, db_user.username)
+    return db_user
+
+@app.delete("/async/users/{user_id}")
+async def delete_user(user_id: int, session: AsyncSession = Depends(get_async_session)):
+    user = await get_or_404(session, User, user_id, "User not found")
+    result = await session.execute(select(Task).where(Task.assigned_to == user_id))
+    for task in result.scalars().all():
+        task.assigned_to = None
+        session.add(task)
+
+    username = user.username
+    await session.delete(user)
+    await session.commit()
+    auth_user_cache.invalidate(username)
+    return {"message": f"User {user_id} has been deleted"}
+
+@app.get("/async/users/{user_id}/skills", response_model=List[UserSkillLink])
+async def get_user_skills(user_id: int, session: AsyncSession = Depends(get_async_session)):
+    await get_or_404(session, User, user_id, "User not found")
+    result = await session.execute(select(UserSkillLink).where(UserSkillLink.user_id == user_id))
+    return result.scalars().all()
+
+@app.post("/async/users/{user_id}/skills", response_model=UserSkillLink)
+async def add_user_skill(user_id: int, user_skill: UserSkillLink, session: AsyncSession = Depends(get_async_session)):
+    await get_or_404(session, User, user_id, "User not found")
+    await get_or_404(session, Skill, user_skill.skill_id, "Skill not found")
 
-@app.get("/async/skills/", response_model=List[Skill])
-async def get_skills(session: AsyncSession = Depends(get_async_session)):
-    """Асинхронно получает список всех навыков"""
-    result = await session.execute(select(Skill))
+    result = await session.execute(
+        select(UserSkillLink).where(
+            UserSkillLink.user_id == user_id,
+            UserSkillLink.skill_id == user_skill.skill_id
+        )
+    )
+    if result.scalars().first():
+        raise HTTPException(status_code=400, detail="User already has this skill")
+
+    user_skill.user_id = user_id
+    session.add(user_skill)
+    await session.commit()
+    await session.refresh(user_skill)
+    return user_skill
+
+@app.patch("/async/users/{user_id}/skills/{skill_id}", response_model=UserSkillLink)
+async def update_user_skill(
+    user_id: int,
+    skill_id: int,
+    user_skill: UserSkillLink,
+    session: AsyncSession = Depends(get_async_session)
+):
+    result = await session.execute(
+        select(UserSkillLink).where(
+            UserSkillLink.user_id == user_id,
+            UserSkillLink.skill_id == skill_id
+        )
+    )
+    db_user_skill = result.scalars().first()
+    if not db_user_skill:
+        raise HTTPException(status_code=404, detail="User skill link not found")
+
+    for key, value in user_skill.model_dump(exclude_unset=True).items():
+        if key not in ["user_id", "skill_id"]:  # Не обновляем первичные ключи
+            setattr(db_user_skill, key, value)
+
+    session.add(db_user_skill)
+    await session.commit()
+    await session.refresh(db_user_skill)
+    return db_user_skill
+
+# Навыки
+@app.get("/async/skills/", response_model=Page[Skill])
+async def get_skills(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно получает страницу навыков"""
+    result = await session.execute(keyset_paginate(select(Skill), Skill.id, cursor, limit))
     skills = result.scalars().all()
-    return skills
+    return build_page(skills, limit)
 
 @app.get("/async/skills/{skill_id}", response_model=Skill)
 async def get_skill(skill_id: int, session: AsyncSession = Depends(get_async_session)):
@@ -30,6 +281,10 @@ async def get_skill(skill_id: int, session: AsyncSession = Depends(get_async_ses
 @app.post("/async/skills/", response_model=Skill)
 async def create_skill(skill: SkillBase, session: AsyncSession = Depends(get_async_session)):
     """Асинхронно создает новый навык"""
+    if skill.name:
+        result = await session.execute(select(Skill).where(func.lower(Skill.name) == skill.name.lower()))
+        if result.scalars().first():
+            raise HTTPException(status_code=400, detail="Skill already exists")
     db_skill = Skill(**skill.dict())
     session.add(db_skill)
     await session.commit()
@@ -37,17 +292,25 @@ async def create_skill(skill: SkillBase, session: AsyncSession = Depends(get_asy
     return db_skill
 
 @app.put("/async/skills/{skill_id}", response_model=Skill)
+@app.patch("/async/skills/{skill_id}", response_model=Skill)
 async def update_skill(skill_id: int, skill_data: SkillBase, session: AsyncSession = Depends(get_async_session)):
     """Асинхронно обновляет навык"""
     result = await session.execute(select(Skill).where(Skill.id == skill_id))
     db_skill = result.scalars().first()
     if not db_skill:
         raise HTTPException(status_code=404, detail="Skill not found")
-    
+
+    if skill_data.name:
+        result = await session.execute(
+            select(Skill).where(func.lower(Skill.name) == skill_data.name.lower(), Skill.id != skill_id)
+        )
+        if result.scalars().first():
+            raise HTTPException(status_code=400, detail="Skill already exists")
+
     # Обновляем поля
     for key, value in skill_data.dict(exclude_unset=True).items():
         setattr(db_skill, key, value)
-    
+
     session.add(db_skill)
     await session.commit()
     await session.refresh(db_skill)
@@ -60,7 +323,317 @@ async def delete_skill(skill_id: int, session: AsyncSession = Depends(get_async_
     db_skill = result.scalars().first()
     if not db_skill:
         raise HTTPException(status_code=404, detail="Skill not found")
-    
+
     await session.delete(db_skill)
     await session.commit()
-    return {"message": f"Skill {skill_id} has been deleted"}
\ No newline at end of file
+    project_matcher.invalidate()
+    return {"message": f"Skill {skill_id} has been deleted"}
+
+# Проекты
+@app.get("/async/projects/", response_model=Page[Project])
+async def get_projects(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно получает страницу проектов"""
+    result = await session.execute(keyset_paginate(select(Project), Project.id, cursor, limit))
+    return build_page(result.scalars().all(), limit)
+
+@app.get("/async/projects/matching/{user_id}", response_model=Page[ProjectMatch])
+async def find_matching_projects(
+    user_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно ранжирует проекты по навыкам пользователя"""
+    await get_or_404(session, User, user_id, "User not found")
+    result = await session.execute(
+        select(UserSkillLink.skill_id).where(UserSkillLink.user_id == user_id)
+    )
+    user_skill_ids = result.scalars().all()
+
+    after = decode_cursor(cursor, float, int) if cursor else None
+    index = await session.run_sync(project_matcher.get_index)
+    ranked = index.top(user_skill_ids, limit + 1, after)
+    # Лишняя строка показывает, есть ли следующая страница (как в build_page)
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+    if not ranked:
+        return Page(items=[])
+
+    result = await session.execute(
+        select(Project).where(Project.id.in_([project_id for project_id, _ in ranked]))
+    )
+    projects_by_id = {project.id: project for project in result.scalars().all()}
+    items = [
+        ProjectMatch(**projects_by_id[project_id].model_dump(), match_score=score)
+        for project_id, score in ranked
+        if project_id in projects_by_id
+    ]
+
+    next_cursor = None
+    if has_more:
+        last_id, last_score = ranked[-1]
+        next_cursor = encode_cursor(last_score, last_id)
+    return Page(items=items, next_cursor=next_cursor)
+
+@app.get("/async/projects/{project_id}", response_model=ProjectResponse)
+async def get_project(project_id: int, session: AsyncSession = Depends(get_async_session)):
+    """Асинхронно получает проект вместе с командами, задачами и навыками"""
+    result = await session.execute(
+        select(Project).where(Project.id == project_id).options(*load_options(Project, "get_project"))
+    )
+    project = result.scalars().first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@app.post("/async/projects/", response_model=Project)
+async def create_project(project: Project, session: AsyncSession = Depends(get_async_session)):
+    session.add(project)
+    await session.commit()
+    await session.refresh(project)
+    return project
+
+@app.patch("/async/projects/{project_id}", response_model=Project)
+async def update_project(project_id: int, project: ProjectBase, session: AsyncSession = Depends(get_async_session)):
+    db_project = await get_or_404(session, Project, project_id, "Project not found")
+    for key, value in project.model_dump(exclude_unset=True).items():
+        setattr(db_project, key, value)
+
+    session.add(db_project)
+    await session.commit()
+    await session.refresh(db_project)
+    return db_project
+
+@app.delete("/async/projects/{project_id}")
+async def delete_project(project_id: int, session: AsyncSession = Depends(get_async_session)):
+    project = await get_or_404(session, Project, project_id, "Project not found")
+    await session.delete(project)
+    await session.commit()
+    project_matcher.invalidate()
+    return {"message": f"Project {project_id} has been deleted"}
+
+@app.post("/async/projects/{project_id}/skills", response_model=ProjectSkillLink)
+async def add_project_skill(
+    project_id: int,
+    project_skill: ProjectSkillLink,
+    session: AsyncSession = Depends(get_async_session)
+):
+    await get_or_404(session, Project, project_id, "Project not found")
+    await get_or_404(session, Skill, project_skill.skill_id, "Skill not found")
+
+    result = await session.execute(
+        select(ProjectSkillLink).where(
+            ProjectSkillLink.project_id == project_id,
+            ProjectSkillLink.skill_id == project_skill.skill_id
+        )
+    )
+    if result.scalars().first():
+        raise HTTPException(status_code=400, detail="Skill already added to this project")
+
+    project_skill.project_id = project_id
+    session.add(project_skill)
+    await session.commit()
+    await session.refresh(project_skill)
+    project_matcher.invalidate()
+    return project_skill
+
+@app.get("/async/projects/{project_id}/skills", response_model=List[ProjectSkillLink])
+async def get_project_skills(project_id: int, session: AsyncSession = Depends(get_async_session)):
+    await get_or_404(session, Project, project_id, "Project not found")
+    result = await session.execute(
+        select(ProjectSkillLink).where(ProjectSkillLink.project_id == project_id)
+    )
+    return result.scalars().all()
+
+@app.post("/async/projects/{project_id}/teams", response_model=ProjectTeamLink)
+async def add_project_team(
+    project_id: int,
+    project_team: ProjectTeamLink,
+    session: AsyncSession = Depends(get_async_session)
+):
+    await get_or_404(session, Project, project_id, "Project not found")
+    await get_or_404(session, Team, project_team.team_id, "Team not found")
+
+    result = await session.execute(
+        select(ProjectTeamLink).where(
+            ProjectTeamLink.project_id == project_id,
+            ProjectTeamLink.team_id == project_team.team_id
+        )
+    )
+    if result.scalars().first():
+        raise HTTPException(status_code=400, detail="Team is already assigned to this project")
+
+    project_team.project_id = project_id
+    if not project_team.start_date:
+        project_team.start_date = datetime.now()
+
+    session.add(project_team)
+    await session.commit()
+    await session.refresh(project_team)
+    return project_team
+
+# Команды
+@app.get("/async/teams/", response_model=Page[Team])
+async def get_teams(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Асинхронно получает страницу команд"""
+    result = await session.execute(keyset_paginate(select(Team), Team.id, cursor, limit))
+    return build_page(result.scalars().all(), limit)
+
+@app.get("/async/teams/matching/{user_id}", response_model=List[Team])
+async def get_matching_teams(user_id: int, session: AsyncSession = Depends(get_async_session)):
+    """Асинхронно подбирает команды для пользователя"""
+    await get_or_404(session, User, user_id, "User not found")
+    return await session.run_sync(find_matching_teams, user_id)
+
+@app.get("/async/teams/{team_id}", response_model=TeamResponse)
+async def get_team(team_id: int, session: AsyncSession = Depends(get_async_session)):
+    """Асинхронно получает команду вместе с участниками и проектами"""
+    result = await session.execute(
+        select(Team).where(Team.id == team_id).options(*load_options(Team, "get_team"))
+    )
+    team = result.scalars().first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return team
+
+@app.post("/async/teams/", response_model=Team)
+async def create_team(team: Team, session: AsyncSession = Depends(get_async_session)):
+    if not team.created_at:
+        team.created_at = datetime.now()
+
+    session.add(team)
+    await session.commit()
+    await session.refresh(team)
+    return team
+
+@app.patch("/async/teams/{team_id}", response_model=Team)
+async def update_team(team_id: int, team: TeamBase, session: AsyncSession = Depends(get_async_session)):
+    db_team = await get_or_404(session, Team, team_id, "Team not found")
+    for key, value in team.model_dump(exclude_unset=True).items():
+        setattr(db_team, key, value)
+
+    session.add(db_team)
+    await session.commit()
+    await session.refresh(db_team)
+    return db_team
+
+@app.delete("/async/teams/{team_id}")
+async def delete_team(team_id: int, session: AsyncSession = Depends(get_async_session)):
+    team = await get_or_404(session, Team, team_id, "Team not found")
+    await session.delete(team)
+    await session.commit()
+    return {"message": f"Team {team_id} has been deleted"}
+
+@app.get("/async/teams/{team_id}/members", response_model=List[TeamMemberLink])
+async def get_team_members(team_id: int, session: AsyncSession = Depends(get_async_session)):
+    result = await session.execute(select(TeamMemberLink).where(TeamMemberLink.team_id == team_id))
+    return result.scalars().all()
+
+@app.post("/async/teams/{team_id}/members", response_model=TeamMemberLink)
+async def add_team_member(
+    team_id: int,
+    team_member: TeamMemberLink,
+    session: AsyncSession = Depends(get_async_session)
+):
+    await get_or_404(session, Team, team_id, "Team not found")
+    await get_or_404(session, User, team_member.user_id, "User not found")
+
+    result = await session.execute(
+        select(TeamMemberLink).where(
+            TeamMemberLink.team_id == team_id,
+            TeamMemberLink.user_id == team_member.user_id
+        )
+    )
+    if result.scalars().first():
+        raise HTTPException(status_code=400, detail="User is already a member of this team")
+
+    team_member.team_id = team_id
+    if not team_member.joined_at:
+        team_member.joined_at = datetime.now()
+
+    session.add(team_member)
+    await session.commit()
+    await session.refresh(team_member)
+    return team_member
+
+@app.patch("/async/teams/{team_id}/members/{user_id}", response_model=TeamMemberLink)
+async def update_team_member(
+    team_id: int,
+    user_id: int,
+    team_member: TeamMemberLink,
+    session: AsyncSession = Depends(get_async_session)
+):
+    result = await session.execute(
+        select(TeamMemberLink).where(
+            TeamMemberLink.team_id == team_id,
+            TeamMemberLink.user_id == user_id
+        )
+    )
+    db_team_member = result.scalars().first()
+    if not db_team_member:
+        raise HTTPException(status_code=404, detail="Team member link not found")
+
+    for key, value in team_member.model_dump(exclude_unset=True).items():
+        if key not in ["team_id", "user_id"]:  # Не обновляем первичные ключи
+            setattr(db_team_member, key, value)
+
+    session.add(db_team_member)
+    await session.commit()
+    await session.refresh(db_team_member)
+    return db_team_member
+
+@app.delete("/async/teams/{team_id}/members/{user_id}")
+async def remove_team_member(
+    team_id: int,
+    user_id: int,
+    current_user_id: int = Query(..., description="ID of the user making the request"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    await get_or_404(session, Team, team_id, "Team not found")
+
+    result = await session.execute(
+        select(TeamMemberLink).where(
+            TeamMemberLink.team_id == team_id,
+            TeamMemberLink.user_id == current_user_id
+        )
+    )
+    current_user_role = result.scalars().first()
+    if not current_user_role or current_user_role.role != TeamRole.LEADER:
+        raise HTTPException(
+            status_code=403,
+            detail="Only team leaders can remove members"
+        )
+
+    result = await session.execute(
+        select(TeamMemberLink).where(
+            TeamMemberLink.team_id == team_id,
+            TeamMemberLink.user_id == user_id
+        )
+    )
+    member_to_remove = result.scalars().first()
+    if not member_to_remove:
+        raise HTTPException(status_code=404, detail="User is not a member of this team")
+
+    await session.delete(member_to_remove)
+    await session.commit()
+    return {"message": f"User {user_id} has been removed from team {team_id}"}
+
+# Задачи
+@app.delete("/async/tasks/{task_id}")
+async def delete_task(task_id: int, session: AsyncSession = Depends(get_async_session)):
+    result = await session.execute(select(Task).where(Task.id == task_id))
+    task = result.scalars().first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    await session.delete(task)
+    await session.commit()
+    return {"message": f"Task {task_id} has been deleted"}
@@ -1,27 +1,17 @@
-import os
-from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, Session
 
-load_dotenv()
-username = os.getenv("DB_USERNAME", "postgres")
-password = os.getenv("DB_PASSWORD", "")
-host = os.getenv("DB_HOST", "localhost")
-database = os.getenv("DB_NAME", "web_team_finder")
+from db_config import create_async_db_engine
 
-async_db_url = f'postgresql+asyncpg://{username}:{password}@{host}/{database}'
+async_engine = create_async_db_engine()
 
-async_engine = create_async_engine(
-    async_db_url,
-    echo=True,
-    future=True
-)
-
-# Создаем фабрику асинхронных сессий
+# Создаем фабрику асинхронных сессий. Синхронная сессия внутри — из SQLModel,
+# чтобы общий синхронный код (например, matching) можно было вызвать через run_sync
 async_session_factory = sessionmaker(
     async_engine,
     class_=AsyncSession,
+    sync_session_class=Session,
     expire_on_commit=False
 )
 
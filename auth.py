@@ -3,15 +3,15 @@ from typing import Optional, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Session, select
-from passlib.context import CryptContext
 import os
 from dotenv import load_dotenv
 from models import User, TokenData
 from connection import get_session
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from async_connection import get_async_session
+from password_hashing import password_hasher
+from auth_cache import auth_user_cache
 
 load_dotenv()
 
@@ -21,18 +21,34 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+oauth2_scheme_async = OAuth2PasswordBearer(tokenUrl="async/token")
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_hasher.hash(password)
 
-def authenticate_user(session: Session, username: str, password: str):
+async def authenticate_user(session: Session, username: str, password: str):
     user = session.exec(select(User).where(User.username == username)).first()
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
+        return False
+    return user
+
+async def authenticate_user_async(session: AsyncSession, username: str, password: str):
+    result = await session.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+    if not user:
+        return False
+    if not await verify_password(password, user.hashed_password):
         return False
     return user
 
@@ -46,26 +62,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def decode_token_subject(token: str) -> TokenData:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
+        return TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = session.exec(select(User).where(User.username == token_data.username)).first()
+
+async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
+    token_data = decode_token_subject(token)
+    user = auth_user_cache.get(token_data.username)
     if user is None:
-        raise credentials_exception
+        user = session.exec(select(User).where(User.username == token_data.username)).first()
+        if user is None:
+            raise credentials_exception
+        auth_user_cache.set(user)
+    return user
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme_async),
+    session: AsyncSession = Depends(get_async_session)
+):
+    token_data = decode_token_subject(token)
+    user = auth_user_cache.get(token_data.username)
+    if user is None:
+        result = await session.execute(select(User).where(User.username == token_data.username))
+        user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+        auth_user_cache.set(user)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Кэш пользователей для get_current_user.
+
+Каждый авторизованный запрос проходит через get_current_user, который после
+проверки JWT ищет пользователя по username. Кэш хранит данные пользователя
+по subject токена с ограничением по времени жизни (TTL) и по размеру (LRU),
+чтобы горячий путь авторизации не ходил в БД на каждый запрос.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import make_transient_to_detached
+
+from models import User
+
+load_dotenv()
+
+AUTH_CACHE_MAXSIZE = int(os.getenv("AUTH_CACHE_MAXSIZE", "1024"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+
+class AuthUserCache:
+    """Потокобезопасный TTL + LRU кэш пользователей по username"""
+
+    def __init__(self, maxsize: int = AUTH_CACHE_MAXSIZE, ttl: float = AUTH_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[User]:
+        """Возвращает пользователя из кэша или None.
+
+        Каждый раз создаётся новый отсоединённый (detached) объект: его можно
+        добавить в сессию запроса и изменить без повторного SELECT, и разные
+        запросы не делят один экземпляр.
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            data = entry[1]
+        user = User(**data)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User):
+        data = user.model_dump()
+        with self._lock:
+            self._entries[user.username] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *usernames: str):
+        """Удаляет пользователей из кэша; вызывается при любом изменении пользователя"""
+        with self._lock:
+            for username in usernames:
+                self._entries.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+auth_user_cache = AuthUserCache()
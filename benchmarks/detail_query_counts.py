@@ -0,0 +1,108 @@
+"""Проверка числа SQL-запросов детальных эндпоинтов при разном размере коллекций.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.detail_query_counts --sizes 1 10 100
+    python -m benchmarks.detail_query_counts --strategy lazy   # для сравнения
+"""
+import argparse
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from main import app
+from auth import get_current_active_user
+from connection import get_session
+from eager_loading import DETAIL_LOAD_STRATEGIES
+from models import (
+    Project, ProjectSkillLink, ProjectTeamLink, Skill, SkillLevel, Task, Team,
+    TeamMemberLink, TeamRole, User, UserSkillLink,
+)
+from query_counter import assert_max_queries, count_queries
+
+# Основной запрос плюс по одному запросу на каждую коллекцию ответа
+MAX_QUERIES = {
+    "get_user": 1 + len(DETAIL_LOAD_STRATEGIES["get_user"]),
+    "get_team": 1 + len(DETAIL_LOAD_STRATEGIES["get_team"]),
+    "get_project": 1 + len(DETAIL_LOAD_STRATEGIES["get_project"]),
+}
+
+
+def seed(engine, size: int):
+    """Создаёт пользователя, команду и проект, у каждого по ``size`` элементов в коллекциях"""
+    now = datetime.now()
+    with Session(engine) as session:
+        users = [
+            User(id=i, username=f"user{i}", full_name=f"User {i}", email=f"user{i}@example.com", hashed_password="")
+            for i in range(1, size + 1)
+        ]
+        skills = [Skill(id=i, name=f"skill-{i}", description="") for i in range(1, size + 1)]
+        teams = [Team(id=i, name=f"team-{i}", description="", created_at=now) for i in range(1, size + 1)]
+        projects = [
+            Project(id=i, title=f"project-{i}", description="", start_date=now, status="active")
+            for i in range(1, size + 1)
+        ]
+        session.add_all(users + skills + teams + projects)
+        session.flush()
+        for i in range(1, size + 1):
+            session.add(UserSkillLink(user_id=1, skill_id=i, level=SkillLevel.INTERMEDIATE, years_of_experience=1.0))
+            session.add(TeamMemberLink(team_id=1, user_id=i, role=TeamRole.MEMBER, joined_at=now))
+            if i > 1:
+                session.add(TeamMemberLink(team_id=i, user_id=1, role=TeamRole.MEMBER, joined_at=now))
+            session.add(ProjectTeamLink(project_id=1, team_id=i, start_date=now))
+            if i > 1:
+                session.add(ProjectTeamLink(project_id=i, team_id=1, start_date=now))
+            session.add(ProjectSkillLink(project_id=1, skill_id=i, importance=1))
+            session.add(Task(
+                id=i, project_id=1, assigned_to=1, title=f"task-{i}", description="",
+                status="open", deadline=now, created_at=now,
+            ))
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument(
+        "--strategy", default=None,
+        help="подменить стратегию загрузки всех связей (selectin, joined, subquery, lazy)",
+    )
+    args = parser.parse_args()
+
+    if args.strategy:
+        for strategies in DETAIL_LOAD_STRATEGIES.values():
+            for relationship in strategies:
+                strategies[relationship] = args.strategy
+
+    endpoints = {"get_user": "/users/1", "get_team": "/teams/1", "get_project": "/projects/1"}
+    print(f"{'размер':>7} {'эндпоинт':>12} {'запросов':>9}")
+    for size in args.sizes:
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        SQLModel.metadata.create_all(engine)
+        seed(engine, size)
+
+        def get_test_session():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = get_test_session
+        app.dependency_overrides[get_current_active_user] = lambda: None
+        client = TestClient(app)
+
+        for name, path in endpoints.items():
+            # Без подмены стратегии проверяем, что число запросов не растёт с размером коллекций
+            guard = count_queries(engine) if args.strategy else assert_max_queries(engine, MAX_QUERIES[name])
+            with guard as counter:
+                response = client.get(path)
+                response.raise_for_status()
+            print(f"{size:>7} {name:>12} {counter.count:>9}")
+        engine.dispose()
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
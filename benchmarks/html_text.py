@@ -0,0 +1,81 @@
+"""Скорость получения текста из HTML-описаний вакансий по бэкендам.
+
+Для каждого доступного бэкенда из parsers/html_text.py замеряет число
+описаний в секунду и проверяет, что SkillExtractor находит в тексте те же
+технологии, что и по тексту BeautifulSoup. Запуск из корня репозитория:
+
+    python -m benchmarks.html_text --jobs 2000
+    python -m benchmarks.html_text --corpus jobs.jsonl   # по строке JSON вакансии
+"""
+import argparse
+import json
+import random
+import time
+
+from parsers.html_text import available_backends
+from parsers.skill_extractor import get_extractor
+
+PARAGRAPHS = [
+    "Мы ищем <b>backend-разработчика</b> в команду платформы данных.",
+    "Стек: Python, Django, PostgreSQL, Redis, Celery.",
+    "Будет плюсом опыт с <i>Kubernetes</i>, Terraform и GitLab CI.",
+    "Требования: опыт работы с REST и GraphQL от 3 лет; знание Docker.",
+    "Фронтенд на React &amp; TypeScript, иногда Vue.js.",
+    "Мы предлагаем удалённую работу, гибкий график и ДМС.",
+]
+
+
+def synthetic_corpus(jobs: int, rng: random.Random):
+    descriptions = []
+    for _ in range(jobs):
+        parts = ["<div class=\"vacancy\">"]
+        for _ in range(rng.randint(5, 20)):
+            paragraph = rng.choice(PARAGRAPHS)
+            if rng.random() < 0.3:
+                items = "".join(f"<li>{rng.choice(PARAGRAPHS)}</li>" for _ in range(rng.randint(2, 6)))
+                parts.append(f"<ul>{items}</ul>")
+            else:
+                parts.append(f"<p>{paragraph}</p>")
+        parts.append("</div>")
+        descriptions.append("\n".join(parts))
+    return descriptions
+
+
+def load_corpus(path: str):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line).get("description") or "" for line in file if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="JSONL с вакансиями (поле description)")
+    parser.add_argument("--jobs", type=int, default=2000, help="размер синтетического корпуса")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    descriptions = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.jobs, random.Random(args.seed))
+    total_kb = sum(len(description.encode()) for description in descriptions) / 1024
+    print(f"Описаний: {len(descriptions)}, {total_kb:.0f} КБ HTML")
+
+    extractor = get_extractor()
+    backends = available_backends()
+    reference = None
+    for name in ("bs4", *[name for name in backends if name != "bs4"]):
+        to_text = backends[name]
+        start_time = time.perf_counter()
+        texts = [to_text(description) for description in descriptions]
+        elapsed = time.perf_counter() - start_time
+
+        skills = [extractor.find_technologies(text) for text in texts]
+        if reference is None:
+            reference = skills
+        mismatches = sum(1 for got, expected in zip(skills, reference) if got != expected)
+        print(
+            f"{name:>10}: {len(descriptions) / elapsed:8.0f} описаний/с, "
+            f"{total_kb / 1024 / elapsed:6.1f} МБ/с, "
+            f"расхождений в навыках с bs4: {mismatches}"
+        )
+
+
+if __name__ == "__main__":
+    main()
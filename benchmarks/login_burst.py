@@ -0,0 +1,133 @@
+"""Задержка обычных запросов во время всплеска логинов.
+
+Пока выполняется пачка параллельных запросов к ``/token``, фоновый клиент
+каждые несколько миллисекунд обращается к ``/`` и замеряет задержку. С bcrypt
+на event loop эти запросы ждут окончания хеширования; с пулом процессов
+задержка остаётся низкой. Запуск из корня репозитория:
+
+    python -m benchmarks.login_burst --logins 50
+    python -m benchmarks.login_burst --logins 50 --inline   # bcrypt на event loop
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+import auth
+import main as api
+from connection import get_session
+from models import User
+from password_hashing import _hash, _verify, password_hasher
+
+
+class InlineHasher:
+    """Прежнее поведение: bcrypt прямо в обработчике"""
+
+    async def hash(self, password):
+        return _hash(password)
+
+    async def verify(self, plain_password, hashed_password):
+        return _verify(plain_password, hashed_password)
+
+    def hash_blocking(self, password):
+        return _hash(password)
+
+    def shutdown(self):
+        pass
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def probe(client, stop: asyncio.Event, interval: float, latencies: list):
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        response = await client.get("/")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start_time)
+        await asyncio.sleep(interval)
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        form = {"username": "bench", "password": "bench-password"}
+
+        # Прогрев: запускаем процессы пула до замера
+        await client.post("/token", data=form)
+
+        baseline = []
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop, args.interval, baseline))
+        await asyncio.sleep(0.5)
+        stop.set()
+        await probe_task
+
+        during_burst = []
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop, args.interval, during_burst))
+        start_time = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/token", data=form) for _ in range(args.logins)))
+        burst_time = time.perf_counter() - start_time
+        stop.set()
+        await probe_task
+
+    codes = {}
+    for response in responses:
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+    mode = "inline" if args.inline else f"pool ({password_hasher.max_workers} процессов)"
+    print(f"Режим: {mode}")
+    print(f"Логинов: {args.logins}, время всплеска: {burst_time:.2f} с, коды ответов: {codes}")
+    for name, latencies in (("без нагрузки", baseline), ("во время всплеска", during_burst)):
+        if not latencies:
+            print(f"GET / {name}: нет ни одного ответа")
+            continue
+        print(
+            f"GET / {name}: {len(latencies)} запросов, "
+            f"p50 {statistics.median(latencies) * 1000:.1f} мс, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.1f} мс, "
+            f"max {max(latencies) * 1000:.1f} мс"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50, help="параллельных запросов к /token")
+    parser.add_argument("--interval", type=float, default=0.005, help="пауза между пробными запросами, с")
+    parser.add_argument("--inline", action="store_true", help="хешировать на event loop, как раньше")
+    args = parser.parse_args()
+
+    if auth.SECRET_KEY is None:
+        auth.SECRET_KEY = "benchmark-secret"
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(
+            username="bench", full_name="Bench", email="bench@example.com",
+            hashed_password=_hash("bench-password"),
+        ))
+        session.commit()
+
+    def get_bench_session():
+        with Session(engine) as session:
+            yield session
+
+    api.app.dependency_overrides[get_session] = get_bench_session
+    if args.inline:
+        auth.password_hasher = api.password_hasher = InlineHasher()
+    try:
+        asyncio.run(run(args))
+    finally:
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
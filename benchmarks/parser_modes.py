@@ -0,0 +1,94 @@
+"""Пропускная способность парсера вакансий в разных режимах.
+
+Запускает локальный API вакансий (parsers/mock_api.py) с заданной задержкой
+ответа и размером описаний, временную SQLite-базу и прогоняет один и тот же
+диапазон ID в каждом режиме parsers/executors.py. Чем больше описания,
+тем заметнее, что в режиме async разбор HTML останавливает сетевые
+запросы, а в hybrid он уходит в процессы. Для async-режимов нужен драйвер
+aiosqlite из группы зависимостей dev (``uv sync`` ставит её по умолчанию).
+Запуск из корня репозитория:
+
+    python -m benchmarks.parser_modes --jobs 500 --latency 0.05 --paragraphs 200
+    python -m benchmarks.parser_modes --modes async hybrid --workers 50
+    python -m benchmarks.parser_modes --latency-dist lognormal --error-rate 0.05
+    python -m benchmarks.parser_modes --modes async --workers 100 --rate-limit 300
+    python -m benchmarks.parser_modes --timings-json stages.json   # время этапов по режимам
+"""
+import argparse
+import os
+import tempfile
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, SQLModel, create_engine
+
+import parsers.executors as executors
+from parsers import stage_timings
+from parsers.logs import configure_logging, log_level_argument
+from parsers.mock_api import LATENCY_DISTRIBUTIONS, MockApiConfig, running_mock_api
+from parsers.pipeline import set_base_url
+
+
+def use_database(path: str):
+    """Подменяет БД исполнителей на новую SQLite-базу"""
+    if os.path.exists(path):
+        os.remove(path)
+    executors.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(executors.engine)
+    executors.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    executors.async_session_factory = sessionmaker(
+        executors.async_engine, class_=AsyncSession, sync_session_class=Session, expire_on_commit=False
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500, help="сколько ID вакансий обработать")
+    parser.add_argument("--latency", type=float, default=0.05, help="средняя задержка ответа API, с")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="лимит API, запросов в секунду (сверх — 429)")
+    parser.add_argument("--paragraphs", type=int, default=100, help="абзацев в описании вакансии")
+    parser.add_argument("--workers", type=int, default=20, help="потоков, процессов или соединений к API")
+    parser.add_argument("--processes", type=int, default=None, help="процессов в режиме hybrid")
+    parser.add_argument("--modes", nargs="+", choices=sorted(executors.EXECUTORS),
+                        default=["thread", "process", "async", "hybrid"])
+    parser.add_argument("--log-level", type=log_level_argument, default="ERROR", help="уровень журнала парсера во время прогона")
+    parser.add_argument("--timings", action="store_true", help="вывести p50/p95/p99 по этапам для каждого режима")
+    parser.add_argument("--timings-json", metavar="PATH", help="сохранить сводку и гистограммы этапов всех режимов")
+    args = parser.parse_args()
+
+    config = MockApiConfig(
+        latency=args.latency, latency_dist=args.latency_dist, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, paragraphs=args.paragraphs,
+    )
+    db_path = os.path.join(tempfile.mkdtemp(), "parser_modes.db")
+    print(
+        f"Вакансий: {args.jobs}, задержка API {args.latency * 1000:.0f} мс ({args.latency_dist}), "
+        f"абзацев в описании: {args.paragraphs}, ядер CPU: {os.cpu_count()}"
+    )
+    timed = args.timings or args.timings_json
+    stages = {}
+    for mode in args.modes:
+        use_database(db_path)
+        timings = stage_timings.enable() if timed else None
+        options = {"workers": args.workers}
+        if mode == "hybrid" and args.processes:
+            options["processes"] = args.processes
+        # Свой сервер на каждый режим: ошибки зависят от номера попытки, счёт начинается заново
+        with running_mock_api(config) as base_url, configure_logging(args.log_level):
+            set_base_url(base_url)
+            report = executors.EXECUTORS[mode](range(1, args.jobs + 1), **options)
+        print(
+            f"{mode:>8}: {report['elapsed']:6.2f} с, {report['jobs'] / report['elapsed']:7.1f} вакансий/с, "
+            f"активных {report['parsed']}, с ошибкой {report['statuses'].get('error', 0)}, "
+            f"навыков найдено {report['skills_found']}"
+        )
+        if timings is not None:
+            print(stage_timings.format_stages(report['stages']))
+            stages[mode] = stage_timings.run_data(report, timings)
+    if args.timings_json:
+        stage_timings.dump_json(args.timings_json, stages)
+
+if __name__ == "__main__":
+    main()
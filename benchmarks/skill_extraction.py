@@ -0,0 +1,126 @@
+"""Скорость извлечения технологий из текста вакансий.
+
+Сравнивает прежний способ (re.findall по каждому шаблону из tech_patterns,
+шаблоны компилируются при каждом вызове) с SkillExtractor, который
+проходит текст один раз. Словарь можно расширить синтетическими терминами,
+чтобы увидеть, как время зависит от его размера. HTML заранее убирается из
+описаний, замеряется только поиск. Запуск из корня репозитория:
+
+    python -m benchmarks.skill_extraction --jobs 2000 --extra-terms 0 1000 5000
+    python -m benchmarks.skill_extraction --corpus jobs.jsonl   # по строке JSON вакансии
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from parsers.html_text import html_to_text
+from parsers.skill_extractor import SkillExtractor, load_vocabulary
+
+# Шаблоны из прежней версии extract_skills_from_job
+LEGACY_PATTERNS = [
+    r'(?:C#|\.NET|ASP\.NET|JavaScript|TypeScript|Python|Java|Kotlin|Swift|Go|Rust|PHP|Ruby|SQL|NoSQL)',
+    r'(?:React|Angular|Vue|Node\.js|Express|Django|Flask|Spring|Hibernate|Laravel|Rails)',
+    r'(?:PostgreSQL|MySQL|Oracle|MongoDB|Cassandra|Redis|Elasticsearch|DynamoDB)',
+    r'(?:Docker|Kubernetes|AWS|Azure|GCP|Terraform|Ansible|Jenkins|GitLab CI|GitHub Actions)',
+    r'(?:REST|GraphQL|gRPC|WebSocket|Kafka|RabbitMQ|NATS|ZeroMQ)',
+    r'(?:HTML|CSS|SASS|LESS|Bootstrap|Tailwind|Material UI|Ant Design)',
+    r'(?:TDD|BDD|CI/CD|Agile|Scrum|Kanban|DevOps|SRE)'
+]
+
+FILLER = (
+    "Мы ищем разработчика в команду платформы. Требуется опыт коммерческой разработки "
+    "от трёх лет, умение работать в команде и желание развиваться. Мы предлагаем "
+    "удалённую работу, гибкий график и расширенную медицинскую страховку."
+).split()
+
+
+def synthetic_terms(count: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return {f"{''.join(rng.choices(letters, k=rng.randint(4, 9)))}{i}" for i in range(count)}
+
+
+def synthetic_corpus(jobs: int, vocabulary, rng: random.Random):
+    names = sorted(set(vocabulary.values()))
+    texts = []
+    for _ in range(jobs):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(80, 300))]
+        for _ in range(rng.randint(3, 12)):
+            words.insert(rng.randrange(len(words)), rng.choice(names))
+        texts.append(" ".join(words))
+    return texts
+
+
+def load_corpus(path: str):
+    texts = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                description = json.loads(line).get("description") or ""
+                texts.append(html_to_text(description))
+    return texts
+
+
+def legacy_find(texts, patterns):
+    found = 0
+    for text in texts:
+        for pattern in patterns:
+            found += len(re.findall(pattern, text, re.IGNORECASE))
+    return found
+
+
+def single_pass_find(texts, extractor):
+    found = 0
+    for text in texts:
+        found += len(extractor.find_technologies(text))
+    return found
+
+
+def measure(fn, *args):
+    start_time = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="JSONL с вакансиями (поле description)")
+    parser.add_argument("--jobs", type=int, default=2000, help="размер синтетического корпуса")
+    parser.add_argument("--extra-terms", type=int, nargs="+", default=[0, 1000, 5000],
+                        help="сколько синтетических терминов добавить к словарю")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base_vocabulary = load_vocabulary()
+    texts = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.jobs, base_vocabulary, rng)
+    total_chars = sum(len(text) for text in texts)
+    print(f"Вакансий: {len(texts)}, символов текста: {total_chars}")
+
+    for extra in args.extra_terms:
+        vocabulary = dict(base_vocabulary)
+        vocabulary.update({term: term for term in synthetic_terms(extra, rng)})
+        # Прежний способ с тем же словарём: по шаблону на каждые 10 терминов, как в tech_patterns
+        extra_terms = sorted(set(vocabulary) - set(base_vocabulary))
+        patterns = LEGACY_PATTERNS + [
+            "(?:" + "|".join(map(re.escape, extra_terms[i:i + 10])) + ")"
+            for i in range(0, len(extra_terms), 10)
+        ]
+
+        start_time = time.perf_counter()
+        extractor = SkillExtractor(vocabulary)
+        compile_time = time.perf_counter() - start_time
+
+        legacy_time = measure(legacy_find, texts, patterns)
+        single_time = measure(single_pass_find, texts, extractor)
+        print(
+            f"словарь {len(vocabulary):>5} терминов: "
+            f"по шаблонам ({len(patterns)} шт.) {legacy_time:.3f} с, "
+            f"один проход {single_time:.3f} с (компиляция {compile_time * 1000:.1f} мс), "
+            f"ускорение x{legacy_time / single_time:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Пропускная способность и задержки синхронного и асинхронного API.
+
+Оба приложения должны быть запущены заранее на одной и той же базе, например:
+
+    uvicorn main:app --port 8000
+    uvicorn async_api:app --port 8001
+
+Синхронные обработчики main.py выполняются в threadpool FastAPI, поэтому
+одновременно обслуживается не больше запросов, чем в нём потоков;
+async_api.py ждёт ответа БД на event loop. Запуск из корня репозитория:
+
+    python -m benchmarks.sync_vs_async --concurrency 200 --requests 5000
+    python -m benchmarks.sync_vs_async --path "projects/matching/1?limit=20"
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def fetch(session, url):
+    async with session.get(url) as response:
+        await response.read()
+        return response.status
+
+
+async def worker(session, url, remaining, latencies, codes):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        start_time = time.perf_counter()
+        try:
+            status = await fetch(session, url)
+        except aiohttp.ClientError as e:
+            status = type(e).__name__
+        latencies.append(time.perf_counter() - start_time)
+        codes[status] = codes.get(status, 0) + 1
+
+
+async def run_load(url, concurrency, requests):
+    latencies, codes = [], {}
+    remaining = [requests]
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Прогрев: открываем соединения и пул БД до замера
+        await asyncio.gather(*(fetch(session, url) for _ in range(min(concurrency, 10))))
+        start_time = time.perf_counter()
+        await asyncio.gather(*(
+            worker(session, url, remaining, latencies, codes) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start_time
+    return elapsed, latencies, codes
+
+
+def report(name, elapsed, latencies, codes):
+    print(
+        f"{name}: {len(latencies) / elapsed:.0f} запросов/с, "
+        f"p50 {statistics.median(latencies) * 1000:.1f} мс, "
+        f"p99 {percentile(latencies, 0.99) * 1000:.1f} мс, "
+        f"max {max(latencies) * 1000:.1f} мс, коды ответов: {codes}"
+    )
+
+
+async def run(args):
+    path = args.path.lstrip("/")
+    targets = (
+        ("sync ", f"{args.sync_url.rstrip('/')}/{path}"),
+        ("async", f"{args.async_url.rstrip('/')}/async/{path}"),
+    )
+    print(f"Параллельных клиентов: {args.concurrency}, запросов: {args.requests}, путь: /{path}")
+    for name, url in targets:
+        report(name, *await run_load(url, args.concurrency, args.requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sync-url", default="http://127.0.0.1:8000", help="адрес main:app")
+    parser.add_argument("--async-url", default="http://127.0.0.1:8001", help="адрес async_api:app")
+    parser.add_argument("--path", default="skills/?limit=50", help="путь без префикса /async")
+    parser.add_argument("--concurrency", type=int, default=100, help="параллельных клиентов")
+    parser.add_argument("--requests", type=int, default=2000, help="всего запросов на каждый стек")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Бенчмарк подбора команд: число запросов и время ответа в зависимости от числа команд.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.team_matching --teams 1000 10000
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from matching import find_matching_teams
+from models import SkillLevel, Team, TeamMemberLink, TeamRole, User, UserSkillLink, Skill
+from query_counter import count_queries
+
+SKILLS = 200
+SKILLS_PER_USER = 3
+
+
+def legacy_find_matching_teams(session: Session, user_id: int):
+    """Прежняя реализация эндпоинта: запросы на каждую команду и каждого участника"""
+    user_skills = session.exec(
+        select(UserSkillLink).where(UserSkillLink.user_id == user_id)
+    ).all()
+    user_skill_ids = [us.skill_id for us in user_skills]
+    user_teams = session.exec(
+        select(TeamMemberLink.team_id).where(TeamMemberLink.user_id == user_id)
+    ).all()
+    teams = session.exec(select(Team)).all()
+    matching_teams = []
+    for team in teams:
+        if team.id in user_teams:
+            continue
+        team_members = session.exec(
+            select(TeamMemberLink.user_id).where(TeamMemberLink.team_id == team.id)
+        ).all()
+        team_skill_ids = []
+        for member_id in team_members:
+            member_skills = session.exec(
+                select(UserSkillLink.skill_id).where(UserSkillLink.user_id == member_id)
+            ).all()
+            team_skill_ids.extend(member_skills)
+        has_unique_skills = any(skill_id not in team_skill_ids for skill_id in user_skill_ids)
+        has_high_level_skills = session.exec(
+            select(UserSkillLink).where(
+                UserSkillLink.user_id == user_id,
+                UserSkillLink.level.in_([SkillLevel.ADVANCED, SkillLevel.EXPERT])
+            )
+        ).first() is not None
+        if has_unique_skills or has_high_level_skills:
+            matching_teams.append(team)
+    return matching_teams
+
+
+def seed(engine, num_teams: int, members_per_team: int, rng: random.Random):
+    """Заполняет БД командами, пользователями и их навыками"""
+    num_users = max(num_teams * members_per_team // 4, members_per_team)
+    now = datetime.now()
+    levels = [SkillLevel.BEGINNER, SkillLevel.INTERMEDIATE]
+    with Session(engine) as session:
+        session.execute(insert(Skill), [
+            {"id": i, "name": f"skill-{i}", "description": ""} for i in range(1, SKILLS + 1)
+        ])
+        session.execute(insert(User), [
+            {
+                "id": i, "username": f"user{i}", "full_name": f"User {i}",
+                "email": f"user{i}@example.com", "hashed_password": "", "created_at": now,
+            }
+            for i in range(1, num_users + 1)
+        ])
+        session.execute(insert(UserSkillLink), [
+            {"user_id": user_id, "skill_id": skill_id, "level": rng.choice(levels), "years_of_experience": 1.0}
+            for user_id in range(1, num_users + 1)
+            for skill_id in rng.sample(range(1, SKILLS + 1), SKILLS_PER_USER)
+        ])
+        session.execute(insert(Team), [
+            {"id": i, "name": f"team-{i}", "description": "", "created_at": now}
+            for i in range(1, num_teams + 1)
+        ])
+        session.execute(insert(TeamMemberLink), [
+            {"team_id": team_id, "user_id": user_id, "role": TeamRole.MEMBER, "joined_at": now}
+            for team_id in range(1, num_teams + 1)
+            for user_id in rng.sample(range(1, num_users + 1), members_per_team)
+        ])
+        session.commit()
+    return num_users
+
+
+def measure(engine, func, user_id: int):
+    with Session(engine) as session, count_queries(engine) as counter:
+        start_time = time.perf_counter()
+        teams = func(session, user_id)
+        elapsed = time.perf_counter() - start_time
+    return sorted(team.id for team in teams), counter.count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--members", type=int, default=5, help="участников в команде")
+    parser.add_argument("--skip-legacy", action="store_true", help="не запускать прежнюю реализацию")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'команд':>8} {'реализация':>12} {'запросов':>10} {'время, мс':>10}")
+    for num_teams in args.teams:
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        SQLModel.metadata.create_all(engine)
+        num_users = seed(engine, num_teams, args.members, random.Random(args.seed))
+        user_id = num_users // 2
+
+        implementations = [("set-based", find_matching_teams)]
+        if not args.skip_legacy:
+            implementations.append(("legacy", legacy_find_matching_teams))
+
+        results = {}
+        for name, func in implementations:
+            team_ids, queries, elapsed = measure(engine, func, user_id)
+            results[name] = team_ids
+            print(f"{num_teams:>8} {name:>12} {queries:>10} {elapsed * 1000:>10.1f}")
+
+        if "legacy" in results and results["legacy"] != results["set-based"]:
+            raise SystemExit(f"Результаты реализаций расходятся для {num_teams} команд")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
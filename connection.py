@@ -1,15 +1,8 @@
-import os
-from dotenv import load_dotenv
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import SQLModel, Session
 
-load_dotenv()
-username = os.getenv("DB_USERNAME", "postgres")
-password = os.getenv("DB_PASSWORD", "")
-host = os.getenv("DB_HOST", "localhost")
-database = os.getenv("DB_NAME", "web_team_finder")
+from db_config import create_db_engine
 
-db_url = f'postgresql://{username}:{password}@{host}/{database}'
-engine = create_engine(db_url, echo=True)
+engine = create_db_engine()
 
 
 def init_db():
@@ -0,0 +1,164 @@
+"""Общая настройка подключения к БД для синхронного и асинхронного движков.
+
+Параметры пула и логирования SQL читаются из окружения. Пулы
+инструментированы: PoolMetrics считает выдачи соединений, время ожидания
+свободного соединения, создание соединений сверх pool_size и таймауты,
+чтобы размер пула можно было подбирать по реальной нагрузке.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import create_engine
+
+load_dotenv()
+
+username = os.getenv("DB_USERNAME", "postgres")
+password = os.getenv("DB_PASSWORD", "")
+host = os.getenv("DB_HOST", "localhost")
+database = os.getenv("DB_NAME", "web_team_finder")
+
+db_url = f'postgresql://{username}:{password}@{host}/{database}'
+async_db_url = f'postgresql+asyncpg://{username}:{password}@{host}/{database}'
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+# Логирование каждого SQL-запроса — только для отладки
+DB_ECHO = _env_bool("DB_ECHO", False)
+
+
+class PoolMetrics:
+    """Счётчики пула соединений одного движка"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_overflow(self):
+        with self._lock:
+            self.overflow_events += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Замеряет время получения соединения из пула.
+
+    В замер входит и открытие нового соединения, если свободных в пуле нет.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_checkout(time.perf_counter() - start_time)
+        return connection
+
+    def _inc_overflow(self):
+        created = super()._inc_overflow()
+        # _overflow отсчитывается от -pool_size: положительное значение — соединение сверх пула
+        if created and self._overflow > 0 and self.metrics is not None:
+            self.metrics.record_overflow()
+        return created
+
+    def recreate(self):
+        # engine.dispose() пересоздаёт пул; счётчики переносим в новый
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options() -> Dict:
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "echo": DB_ECHO,
+    }
+
+
+def create_db_engine(url: str = db_url, **kwargs):
+    """Создаёт синхронный движок с настройками пула из окружения"""
+    options = {**_pool_options(), "poolclass": InstrumentedQueuePool, **kwargs}
+    engine = create_engine(url, **options)
+    engine.pool.metrics = PoolMetrics()
+    return engine
+
+
+def create_async_db_engine(url: str = async_db_url, **kwargs) -> AsyncEngine:
+    """Создаёт асинхронный движок с настройками пула из окружения"""
+    options = {**_pool_options(), "poolclass": InstrumentedAsyncQueuePool, **kwargs}
+    engine = create_async_engine(url, **options)
+    engine.sync_engine.pool.metrics = PoolMetrics()
+    return engine
+
+
+def pool_stats(engine) -> Dict:
+    """Текущее состояние пула и накопленные счётчики"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
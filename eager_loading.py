@@ -0,0 +1,34 @@
+"""Стратегии загрузки связей для детальных эндпоинтов.
+
+Модели ответов (UserResponse, TeamResponse, ProjectResponse) читают связи
+при сериализации. Если связи не загружены заранее, каждая коллекция
+подгружается отдельным ленивым запросом, поэтому для каждого эндпоинта явно
+задаётся, какие связи и каким способом загружать вместе с объектом.
+"""
+from typing import Dict
+
+from sqlalchemy.orm import joinedload, lazyload, raiseload, selectinload, subqueryload
+
+LOADERS = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+    "raise": raiseload,
+    "lazy": lazyload,
+}
+
+# Эндпоинт -> {связь: стратегия}. selectin даёт один дополнительный запрос
+# на коллекцию независимо от её размера и не размножает строки, как joined.
+DETAIL_LOAD_STRATEGIES: Dict[str, Dict[str, str]] = {
+    "get_user": {"skills": "selectin", "teams": "selectin", "tasks": "selectin"},
+    "get_team": {"members": "selectin", "projects": "selectin"},
+    "get_project": {"teams": "selectin", "tasks": "selectin", "recommended_skills": "selectin"},
+}
+
+
+def load_options(model, endpoint: str) -> list:
+    """Возвращает опции загрузки связей ``model`` для эндпоинта ``endpoint``"""
+    return [
+        LOADERS[strategy](getattr(model, relationship))
+        for relationship, strategy in DETAIL_LOAD_STRATEGIES[endpoint].items()
+    ]
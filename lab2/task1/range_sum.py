@@ -0,0 +1,67 @@
+"""Сумма целых чисел диапазона [start, end] тремя способами.
+
+- iterative — ``sum(range(...))``: перебор чисел интерпретатором, как в
+  исходных программах; на 10**13 не закончится за разумное время;
+- numpy — диапазон разбивается на куски, каждый суммируется векторно в
+  int64, а суммы кусков складываются в целых Python без переполнения;
+- closed — формула суммы арифметической прогрессии, O(1).
+
+Все три дают одинаковый результат, так что в программах задачи 1 можно
+сравнивать threading, multiprocessing и asyncio на настоящей нагрузке
+(numpy) или проверять разбиение на части мгновенно (closed).
+"""
+from typing import Callable, Dict
+
+import numpy as np
+
+# Чисел в одном куске numpy: ~8 МБ, помещается в кэш и не раздувает память
+NUMPY_CHUNK_SIZE = 1 << 20
+INT64_MAX = np.iinfo(np.int64).max
+DEFAULT_BACKEND = "iterative"
+
+
+def iterative_sum(start: int, end: int) -> int:
+    return sum(range(start, end + 1))
+
+
+def closed_form_sum(start: int, end: int) -> int:
+    if end < start:
+        return 0
+    return (start + end) * (end - start + 1) // 2
+
+
+def numpy_sum(start: int, end: int, chunk_size: int = NUMPY_CHUNK_SIZE) -> int:
+    """Сумма кусками по ``chunk_size`` чисел; кусок сокращается так, чтобы его сумма влезла в int64"""
+    if end < start:
+        return 0
+    largest = max(abs(start), abs(end), 1)
+    if largest > INT64_MAX:
+        raise ValueError("границы диапазона не помещаются в int64")
+    chunk_size = max(1, min(chunk_size, INT64_MAX // largest))
+    total = 0
+    for low in range(start, end + 1, chunk_size):
+        high = min(low + chunk_size, end + 1)
+        total += int(np.arange(low, high, dtype=np.int64).sum())
+    return total
+
+
+BACKENDS: Dict[str, Callable[[int, int], int]] = {
+    "iterative": iterative_sum,
+    "numpy": numpy_sum,
+    "closed": closed_form_sum,
+}
+
+
+def range_sum(start: int, end: int, backend: str = DEFAULT_BACKEND) -> int:
+    """Сумма чисел от ``start`` до ``end`` включительно выбранным способом"""
+    return BACKENDS[backend](start, end)
+
+
+def parse_count(value: str) -> int:
+    """Целое из аргумента командной строки: 10000000000000, 1e13 или 10**13"""
+    if "**" in value:
+        base, exponent = value.split("**")
+        return int(base) ** int(exponent)
+    if "e" in value.lower():
+        return int(float(value))
+    return int(value)
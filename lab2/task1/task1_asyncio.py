@@ -1,19 +1,33 @@
+import argparse
 import asyncio
 import time
 
-async def calculate_sum(start, end):
+try:
+    from lab2.task1.range_sum import BACKENDS, DEFAULT_BACKEND, parse_count, range_sum
+except ImportError:
+    # Запуск файлом (python task1_asyncio.py): рядом лежащий модуль виден напрямую
+    from range_sum import BACKENDS, DEFAULT_BACKEND, parse_count, range_sum
+
+async def calculate_sum(start, end, backend=DEFAULT_BACKEND):
     """Асинхронно вычисляет сумму чисел в диапазоне [start, end]"""
-    return sum(range(start, end + 1))
+    return range_sum(start, end, backend)
 
-async def async_sum(ranges):
-    tasks = [calculate_sum(start, end) for start, end in ranges]
+async def async_sum(ranges, backend=DEFAULT_BACKEND):
+    tasks = [calculate_sum(start, end, backend) for start, end in ranges]
     results = await asyncio.gather(*tasks)
     return sum(results)
 
 async def main():
+    parser = argparse.ArgumentParser(description="Сумма чисел от 1 до TOTAL в asyncio-задачах")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="как считать сумму части: iterative — sum(range), numpy — векторно, closed — формулой")
+    parser.add_argument("--total", type=parse_count, default=10**9,
+                        help="сумма чисел от 1 до TOTAL (например 10**13)")
+    args = parser.parse_args()
+
     # Разбиваем задачу на части
     num_tasks = 8
-    total_range = 10**9
+    total_range = args.total
     chunk_size = total_range // num_tasks
     
     ranges = []
@@ -23,11 +37,11 @@ async def main():
         ranges.append((start, end))
     
     start_time = time.time()
-    result = await async_sum(ranges)
+    result = await async_sum(ranges, args.backend)
     end_time = time.time()
     
     print(f"Результат: {result}")
-    print(f"Время выполнения (asyncio): {end_time - start_time:.2f} секунд")
+    print(f"Время выполнения (asyncio, {args.backend}): {end_time - start_time:.2f} секунд")
 
 if __name__ == "__main__":
     asyncio.run(main())
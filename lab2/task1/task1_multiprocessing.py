@@ -1,23 +1,37 @@
+import argparse
 import multiprocessing
 import time
 
-def calculate_sum(start, end):
+try:
+    from lab2.task1.range_sum import BACKENDS, DEFAULT_BACKEND, parse_count, range_sum
+except ImportError:
+    # Запуск файлом (python task1_multiprocessing.py): рядом лежащий модуль виден напрямую
+    from range_sum import BACKENDS, DEFAULT_BACKEND, parse_count, range_sum
+
+def calculate_sum(start, end, backend=DEFAULT_BACKEND):
     """Вычисляет сумму чисел в диапазоне [start, end]"""
-    return sum(range(start, end + 1))
+    return range_sum(start, end, backend)
 
-def process_worker(start, end):
-    return calculate_sum(start, end)
+def process_worker(start, end, backend):
+    return calculate_sum(start, end, backend)
 
-def multiprocess_sum(ranges):
+def multiprocess_sum(ranges, backend=DEFAULT_BACKEND):
     """Вычисляет сумму с использованием процессов"""
     with multiprocessing.Pool(processes=len(ranges)) as pool:
-        results = pool.starmap(process_worker, ranges)
+        results = pool.starmap(process_worker, [(start, end, backend) for start, end in ranges])
     return sum(results)
 
 def main():
+    parser = argparse.ArgumentParser(description="Сумма чисел от 1 до TOTAL в процессах")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="как считать сумму части: iterative — sum(range), numpy — векторно, closed — формулой")
+    parser.add_argument("--total", type=parse_count, default=10**9,
+                        help="сумма чисел от 1 до TOTAL (например 10**13)")
+    args = parser.parse_args()
+
     # Разбиваем задачу на части
     num_processes = multiprocessing.cpu_count()
-    total_range = 10**9
+    total_range = args.total
     chunk_size = total_range // num_processes
     
     ranges = []
@@ -28,11 +42,11 @@ def main():
     
     # Обычный подход
     start_time = time.time()
-    result = multiprocess_sum(ranges)
+    result = multiprocess_sum(ranges, args.backend)
     end_time = time.time()
     
     print(f"Результат: {result}")
-    print(f"Время выполнения (multiprocessing): {end_time - start_time:.2f} секунд")
+    print(f"Время выполнения (multiprocessing, {args.backend}): {end_time - start_time:.2f} секунд")
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
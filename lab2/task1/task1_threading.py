@@ -1,16 +1,23 @@
+import argparse
 import threading
 import time
 
-def calculate_sum(start, end):
+try:
+    from lab2.task1.range_sum import BACKENDS, DEFAULT_BACKEND, parse_count, range_sum
+except ImportError:
+    # Запуск файлом (python task1_threading.py): рядом лежащий модуль виден напрямую
+    from range_sum import BACKENDS, DEFAULT_BACKEND, parse_count, range_sum
+
+def calculate_sum(start, end, backend=DEFAULT_BACKEND):
     """Вычисляет сумму чисел в диапазоне [start, end]"""
-    return sum(range(start, end + 1))
+    return range_sum(start, end, backend)
 
-def threaded_sum(ranges):
+def threaded_sum(ranges, backend=DEFAULT_BACKEND):
     """Вычисляет сумму с использованием потоков"""
     results = [0] * len(ranges)
     
     def worker(index, start, end):
-        results[index] = calculate_sum(start, end)
+        results[index] = calculate_sum(start, end, backend)
     
     threads = []
     for i, (start, end) in enumerate(ranges):
@@ -24,9 +31,16 @@ def threaded_sum(ranges):
     return sum(results)
 
 def main():
+    parser = argparse.ArgumentParser(description="Сумма чисел от 1 до TOTAL в потоках")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="как считать сумму части: iterative — sum(range), numpy — векторно, closed — формулой")
+    parser.add_argument("--total", type=parse_count, default=10**9,
+                        help="сумма чисел от 1 до TOTAL (например 10**13)")
+    args = parser.parse_args()
+
     # Разбиваем задачу на части
     num_threads = 1
-    total_range = 10**9
+    total_range = args.total
     chunk_size = total_range // num_threads
     
     ranges = []
@@ -36,11 +50,11 @@ def main():
         ranges.append((start, end))
     
     start_time = time.time()
-    result = threaded_sum(ranges)
+    result = threaded_sum(ranges, args.backend)
     end_time = time.time()
     
     print(f"Результат: {result}")
-    print(f"Время выполнения (threading): {end_time - start_time:.2f} секунд")
+    print(f"Время выполнения (threading, {args.backend}): {end_time - start_time:.2f} секунд")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, Query, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import List, Optional
-from sqlmodel import Session, select, delete
+from sqlmodel import Session, select, delete, func
 from contextlib import asynccontextmanager
 from datetime import timedelta
 
@@ -9,21 +9,31 @@ from models import (
     Project, Skill, Team, TeamMemberLink, User, UserSkillLink, SkillLevel, Task, 
     ProjectTeamLink, UserBase, SkillBase, TeamBase, ProjectBase, TeamRole, ProjectSkillLink,
     UserResponse, TeamResponse, ProjectResponse, TaskResponse, 
-    UserCreate, UserLogin, Token, PasswordChange
+    UserCreate, UserLogin, Token, PasswordChange, ProjectMatch
+)
+from connection import engine, get_session, init_db
+from db_config import pool_stats
+from matching import find_matching_teams, project_matcher
+from eager_loading import load_options
+from pagination import (
+    Page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor,
+    keyset_paginate, build_page
 )
-from connection import get_session, init_db
 from auth import (
     authenticate_user, create_access_token, get_current_user, 
     get_current_active_user, get_password_hash, verify_password,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from password_hashing import password_hasher
+from auth_cache import auth_user_cache
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: initialize the database
     init_db()
     yield
-    # Shutdown: cleanup operations can go here if needed
+    # Shutdown: stop the password hashing worker processes
+    password_hasher.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -54,8 +64,8 @@ def register_user(user_create: UserCreate, session: Session = Depends(get_sessio
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_create.password)
+    # Create new user (bcrypt runs in the hashing process pool)
+    hashed_password = password_hasher.hash_blocking(user_create.password)
     db_user = User(
         username=user_create.username,
         email=user_create.email,
@@ -75,7 +85,7 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: Session = Depends(get_session)
 ):
-    user = authenticate_user(session, form_data.username, form_data.password)
+    user = await authenticate_user(session, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -99,28 +109,37 @@ async def change_password(
     session: Session = Depends(get_session)
 ):
     # Verify current password
-    if not verify_password(password_change.current_password, current_user.hashed_password):
+    if not await verify_password(password_change.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(password_change.new_password)
+    current_user.hashed_password = await get_password_hash(password_change.new_password)
     session.add(current_user)
     session.commit()
+    auth_user_cache.invalidate(current_user.username)
     return {"message": "Password updated successfully"}
 
+@app.get("/metrics/auth-cache")
+def get_auth_cache_metrics():
+    return auth_user_cache.stats()
+
+@app.get("/metrics/db-pool")
+def get_db_pool_metrics():
+    return pool_stats(engine)
+
 # Update existing endpoints to use authentication
-@app.get("/users/", response_model=List[User])
+@app.get("/users/", response_model=Page[User])
 def get_users(
-    skip: int = 0, 
-    limit: int = 100, 
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_session)
 ):
-    users = session.exec(select(User).offset(skip).limit(limit)).all()
-    return users
+    users = session.exec(keyset_paginate(select(User), User.id, cursor, limit)).all()
+    return build_page(users, limit)
 
 @app.get("/users/{user_id}", response_model=UserResponse)
 def get_user(
@@ -128,7 +147,9 @@ def get_user(
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_session)
 ):
-    user = session.get(User, user_id)
+    user = session.exec(
+        select(User).where(User.id == user_id).options(*load_options(User, "get_user"))
+    ).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -147,6 +168,7 @@ def update_user(user_id: int, user: UserBase, session: Session = Depends(get_ses
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    previous_username = db_user.username
     user_data = user.model_dump(exclude_unset=True)
     for key, value in user_data.items():
         setattr(db_user, key, value)
@@ -154,13 +176,18 @@ def update_user(user_id: int, user: UserBase, session: Session = Depends(get_ses
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    auth_user_cache.invalidate(previous_username, db_user.username)
     return db_user
 
 # Skills
-@app.get("/skills/", response_model=List[Skill])
-def get_skills(session: Session = Depends(get_session)):
-    skills = session.exec(select(Skill)).all()
-    return skills
+@app.get("/skills/", response_model=Page[Skill])
+def get_skills(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
+    skills = session.exec(keyset_paginate(select(Skill), Skill.id, cursor, limit)).all()
+    return build_page(skills, limit)
 
 @app.get("/skills/{skill_id}", response_model=Skill)
 def get_skill(skill_id: int, session: Session = Depends(get_session)):
@@ -171,6 +198,8 @@ def get_skill(skill_id: int, session: Session = Depends(get_session)):
 
 @app.post("/skills/", response_model=Skill)
 def create_skill(skill: Skill, session: Session = Depends(get_session)):
+    if skill.name and session.exec(select(Skill).where(func.lower(Skill.name) == skill.name.lower())).first():
+        raise HTTPException(status_code=400, detail="Skill already exists")
     session.add(skill)
     session.commit()
     session.refresh(skill)
@@ -184,6 +213,10 @@ def update_skill(skill_id: int, skill: SkillBase, session: Session = Depends(get
         raise HTTPException(status_code=404, detail="Skill not found")
     
     skill_data = skill.model_dump(exclude_unset=True)
+    if skill_data.get("name") and session.exec(
+        select(Skill).where(func.lower(Skill.name) == skill_data["name"].lower(), Skill.id != skill_id)
+    ).first():
+        raise HTTPException(status_code=400, detail="Skill already exists")
     for key, value in skill_data.items():
         setattr(db_skill, key, value)
     
@@ -193,14 +226,20 @@ def update_skill(skill_id: int, skill: SkillBase, session: Session = Depends(get
     return db_skill
 
 # Projects
-@app.get("/projects/", response_model=List[Project])
-def get_projects(session: Session = Depends(get_session)):
-    projects = session.exec(select(Project)).all()
-    return projects
+@app.get("/projects/", response_model=Page[Project])
+def get_projects(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
+    projects = session.exec(keyset_paginate(select(Project), Project.id, cursor, limit)).all()
+    return build_page(projects, limit)
 
 @app.get("/projects/{project_id}", response_model=ProjectResponse)
 def get_project(project_id: int, session: Session = Depends(get_session)):
-    project = session.get(Project, project_id)
+    project = session.exec(
+        select(Project).where(Project.id == project_id).options(*load_options(Project, "get_project"))
+    ).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -229,14 +268,20 @@ def update_project(project_id: int, project: ProjectBase, session: Session = Dep
     return db_project
 
 # Teams
-@app.get("/teams/", response_model=List[Team])
-def get_teams(session: Session = Depends(get_session)):
-    teams = session.exec(select(Team)).all()
-    return teams
+@app.get("/teams/", response_model=Page[Team])
+def get_teams(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
+    teams = session.exec(keyset_paginate(select(Team), Team.id, cursor, limit)).all()
+    return build_page(teams, limit)
 
 @app.get("/teams/{team_id}", response_model=TeamResponse)
 def get_team(team_id: int, session: Session = Depends(get_session)):
-    team = session.get(Team, team_id)
+    team = session.exec(
+        select(Team).where(Team.id == team_id).options(*load_options(Team, "get_team"))
+    ).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return team
@@ -263,27 +308,25 @@ def update_team(team_id: int, team: TeamBase, session: Session = Depends(get_ses
     return db_team
 
 # Поиск пользователей по навыкам
-@app.get("/users/search/", response_model=List[User])
+@app.get("/users/search/", response_model=Page[User])
 def search_users_by_skills(
     skill_ids: List[int] = Query(None), 
     min_level: Optional[SkillLevel] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session)
 ):
-    if not skill_ids:
-        return session.exec(select(User)).all()
+    query = select(User)
     
-    query = select(User).join(UserSkillLink)
+    if skill_ids:
+        # Подзапрос вместо JOIN, чтобы пользователь с несколькими навыками не дублировался
+        matching_users = select(UserSkillLink.user_id).where(UserSkillLink.skill_id.in_(skill_ids))
+        if min_level:
+            matching_users = matching_users.where(UserSkillLink.level >= min_level)
+        query = query.where(User.id.in_(matching_users))
     
-    if min_level:
-        query = query.where(
-            UserSkillLink.skill_id.in_(skill_ids),
-            UserSkillLink.level >= min_level
-        )
-    else:
-        query = query.where(UserSkillLink.skill_id.in_(skill_ids))
-    
-    users = session.exec(query).all()
-    return users
+    users = session.exec(keyset_paginate(query, User.id, cursor, limit)).all()
+    return build_page(users, limit)
 
 # Получение навыков пользователя
 @app.get("/users/{user_id}/skills", response_model=List[UserSkillLink])
@@ -354,58 +397,12 @@ def update_user_skill(
     return db_user_skill
 
 @app.get("/teams/matching/{user_id}", response_model=List[Team])
-def find_matching_teams(user_id: int, session: Session = Depends(get_session)):
+def get_matching_teams(user_id: int, session: Session = Depends(get_session)):
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Получаем навыки пользователя
-    user_skills = session.exec(
-        select(UserSkillLink).where(UserSkillLink.user_id == user_id)
-    ).all()
-    user_skill_ids = [us.skill_id for us in user_skills]
-    
-    # Находим команды, в которых пользователь еще не состоит
-    user_teams = session.exec(
-        select(TeamMemberLink.team_id).where(TeamMemberLink.user_id == user_id)
-    ).all()
-    
-    # Получаем все команды
-    teams = session.exec(select(Team)).all()
-    matching_teams = []
-    
-    for team in teams:
-        # Пропускаем команды, в которых пользователь уже состоит
-        if team.id in user_teams:
-            continue
-        
-        # Получаем навыки всех участников команды
-        team_members = session.exec(
-            select(TeamMemberLink.user_id).where(TeamMemberLink.team_id == team.id)
-        ).all()
-        
-        team_skill_ids = []
-        for member_id in team_members:
-            member_skills = session.exec(
-                select(UserSkillLink.skill_id).where(UserSkillLink.user_id == member_id)
-            ).all()
-            team_skill_ids.extend(member_skills)
-        
-        # Проверяем, есть ли у пользователя уникальные навыки для команды
-        has_unique_skills = any(skill_id not in team_skill_ids for skill_id in user_skill_ids)
-        
-        # Проверяем, есть ли у пользователя навыки высокого уровня
-        has_high_level_skills = session.exec(
-            select(UserSkillLink).where(
-                UserSkillLink.user_id == user_id,
-                UserSkillLink.level.in_([SkillLevel.ADVANCED, SkillLevel.EXPERT])
-            )
-        ).first() is not None
-        
-        if has_unique_skills or has_high_level_skills:
-            matching_teams.append(team)
-    
-    return matching_teams
+    return find_matching_teams(session, user_id)
 
 # Add a recommended skill to a project
 @app.post("/projects/{project_id}/skills", response_model=ProjectSkillLink)
@@ -437,6 +434,7 @@ def add_project_skill(
     session.add(project_skill)
     session.commit()
     session.refresh(project_skill)
+    project_matcher.invalidate()
     return project_skill
 
 # Get recommended skills for a project
@@ -452,42 +450,45 @@ def get_project_skills(project_id: int, session: Session = Depends(get_session))
     return project_skills
 
 # Find matching projects based on user skills
-@app.get("/projects/matching/{user_id}", response_model=List[Project])
-def find_matching_projects(user_id: int, session: Session = Depends(get_session)):
+@app.get("/projects/matching/{user_id}", response_model=Page[ProjectMatch])
+def find_matching_projects(
+    user_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's skills
-    user_skills = session.exec(
-        select(UserSkillLink).where(UserSkillLink.user_id == user_id)
+    user_skill_ids = session.exec(
+        select(UserSkillLink.skill_id).where(UserSkillLink.user_id == user_id)
+    ).all()
+    
+    # Ранжируем проекты по доле важности требуемых навыков, которыми владеет пользователь
+    after = decode_cursor(cursor, float, int) if cursor else None
+    ranked = project_matcher.get_index(session).top(user_skill_ids, limit + 1, after)
+    # Лишняя строка показывает, есть ли следующая страница (как в build_page)
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+    if not ranked:
+        return Page(items=[])
+    
+    projects = session.exec(
+        select(Project).where(Project.id.in_([project_id for project_id, _ in ranked]))
     ).all()
-    user_skill_ids = [us.skill_id for us in user_skills]
-    
-    # Get all projects
-    projects = session.exec(select(Project)).all()
-    matching_projects = []
-    
-    for project in projects:
-        # Get project's recommended skills
-        project_skills = session.exec(
-            select(ProjectSkillLink).where(ProjectSkillLink.project_id == project.id)
-        ).all()
-        project_skill_ids = [ps.skill_id for ps in project_skills]
-        
-        # Calculate match score based on how many of the user's skills match project requirements
-        matching_skills = set(user_skill_ids).intersection(set(project_skill_ids))
-        if matching_skills:
-            # Calculate a match score (percentage of required skills that the user has)
-            match_score = len(matching_skills) / len(project_skill_ids) if project_skill_ids else 0
-            
-            # Add project to matching list if there's at least one matching skill
-            if match_score > 0:
-                # We could add the match score to the project object if needed
-                # For now, just add the project to the list
-                matching_projects.append(project)
-    
-    return matching_projects
+    projects_by_id = {project.id: project for project in projects}
+    items = [
+        ProjectMatch(**projects_by_id[project_id].model_dump(), match_score=score)
+        for project_id, score in ranked
+        if project_id in projects_by_id
+    ]
+    
+    next_cursor = None
+    if has_more:
+        last_id, last_score = ranked[-1]
+        next_cursor = encode_cursor(last_score, last_id)
+    return Page(items=items, next_cursor=next_cursor)
 
 # Обновление связи команды и участника
 @app.patch("/teams/{team_id}/members/{user_id}", response_model=TeamMemberLink)
@@ -623,8 +624,10 @@ def delete_user(user_id: int, session: Session = Depends(get_session)):
         session.add(task)
     
     # Delete the user
+    username = user.username
     session.delete(user)
     session.commit()
+    auth_user_cache.invalidate(username)
     
     return {"message": f"User {user_id} has been deleted"}
 
@@ -638,6 +641,7 @@ def delete_skill(skill_id: int, session: Session = Depends(get_session)):
     # Delete the skill
     session.delete(skill)
     session.commit()
+    project_matcher.invalidate()
     
     return {"message": f"Skill {skill_id} has been deleted"}
 
@@ -664,6 +668,7 @@ def delete_project(project_id: int, session: Session = Depends(get_session)):
     # Delete the project
     session.delete(project)
     session.commit()
+    project_matcher.invalidate()
     
     return {"message": f"Project {project_id} has been deleted"}
 
@@ -0,0 +1,160 @@
+"""Подбор команд и проектов для пользователя на основе навыков."""
+import os
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from models import ProjectSkillLink, SkillLevel, Team, TeamMemberLink, UserSkillLink
+
+load_dotenv()
+
+HIGH_SKILL_LEVELS = (SkillLevel.ADVANCED, SkillLevel.EXPERT)
+
+# Через сколько секунд индекс навыков проектов перестраивается, даже если его
+# не инвалидировали явно (например, изменения пришли из другого воркера)
+PROJECT_INDEX_MAX_AGE = float(os.getenv("PROJECT_INDEX_MAX_AGE", "300"))
+
+
+def find_matching_teams(session: Session, user_id: int) -> List[Team]:
+    """Возвращает команды, которым пользователь может быть полезен.
+
+    Команда подходит, если пользователь в ней не состоит и либо владеет
+    навыком, которого нет ни у одного участника команды, либо имеет хотя бы
+    один навык уровня advanced/expert. Покрытие навыков считается агрегатным
+    запросом в БД, поэтому число запросов не зависит от количества команд и
+    участников.
+    """
+    user_skills = session.exec(
+        select(UserSkillLink.skill_id, UserSkillLink.level).where(UserSkillLink.user_id == user_id)
+    ).all()
+    user_skill_ids = {skill_id for skill_id, _ in user_skills}
+    has_high_level_skills = any(level in HIGH_SKILL_LEVELS for _, level in user_skills)
+
+    user_teams = select(TeamMemberLink.team_id).where(TeamMemberLink.user_id == user_id)
+    query = select(Team).where(Team.id.not_in(user_teams)).order_by(Team.id)
+
+    if not has_high_level_skills:
+        if not user_skill_ids:
+            return []
+        # Команды, участники которых уже покрывают все навыки пользователя
+        covered_teams = (
+            select(TeamMemberLink.team_id)
+            .join(UserSkillLink, UserSkillLink.user_id == TeamMemberLink.user_id)
+            .where(UserSkillLink.skill_id.in_(user_skill_ids))
+            .group_by(TeamMemberLink.team_id)
+            .having(func.count(func.distinct(UserSkillLink.skill_id)) == len(user_skill_ids))
+        )
+        query = query.where(Team.id.not_in(covered_teams))
+
+    return session.exec(query).all()
+
+
+class ProjectSkillIndex:
+    """Навыки всех проектов в сжатом построчном (CSR) виде.
+
+    Для проекта ``project_ids[i]`` его навыки лежат в
+    ``skill_ids[indptr[i]:indptr[i + 1]]``, а веса (``ProjectSkillLink.importance``)
+    в том же срезе ``weights``. Такое представление позволяет оценить все
+    проекты за один векторный проход без запросов к БД.
+    """
+
+    def __init__(self, project_ids: np.ndarray, indptr: np.ndarray, skill_ids: np.ndarray, weights: np.ndarray):
+        self.project_ids = project_ids
+        self.indptr = indptr
+        self.skill_ids = skill_ids
+        self.weights = weights
+        self.entry_rows = np.repeat(np.arange(project_ids.size), np.diff(indptr))
+        self.total_weights = np.add.reduceat(weights, indptr[:-1]) if weights.size else np.zeros(0)
+
+    @classmethod
+    def build(cls, session: Session) -> "ProjectSkillIndex":
+        rows = session.exec(
+            select(ProjectSkillLink.project_id, ProjectSkillLink.skill_id, ProjectSkillLink.importance)
+            .order_by(ProjectSkillLink.project_id, ProjectSkillLink.skill_id)
+        ).all()
+        entry_projects = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        skill_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        weights = np.fromiter((1 if row[2] is None else row[2] for row in rows), dtype=np.float64, count=len(rows))
+
+        project_ids, starts = np.unique(entry_projects, return_index=True)
+        indptr = np.append(starts, len(rows)).astype(np.int64)
+        return cls(project_ids, indptr, skill_ids, weights)
+
+    def score(self, user_skill_ids: Iterable[int]) -> np.ndarray:
+        """Доля суммарной важности навыков проекта, которыми владеет пользователь"""
+        user_skills = np.fromiter(user_skill_ids, dtype=np.int64)
+        matched = np.isin(self.skill_ids, user_skills)
+        matched_weights = np.bincount(
+            self.entry_rows, weights=self.weights * matched, minlength=self.project_ids.size
+        )
+        return np.divide(
+            matched_weights, self.total_weights,
+            out=np.zeros_like(matched_weights), where=self.total_weights > 0
+        )
+
+    def top(
+        self,
+        user_skill_ids: Iterable[int],
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Возвращает до ``limit`` пар (project_id, score) по убыванию оценки.
+
+        Проекты без совпавших навыков отбрасываются. ``after`` — оценка и id
+        последнего проекта предыдущей страницы.
+        """
+        scores = self.score(user_skill_ids)
+        mask = scores > 0
+        if after is not None:
+            after_score, after_id = after
+            mask &= (scores < after_score) | ((scores == after_score) & (self.project_ids > after_id))
+        candidates = np.flatnonzero(mask)
+
+        if candidates.size > limit:
+            # Отсекаем всё, что ниже limit-й по величине оценки, не сортируя весь массив
+            kth = np.partition(scores[candidates], candidates.size - limit)[candidates.size - limit]
+            candidates = candidates[scores[candidates] >= kth]
+        order = np.lexsort((self.project_ids[candidates], -scores[candidates]))[:limit]
+        ranked = candidates[order]
+        return [(int(self.project_ids[i]), float(scores[i])) for i in ranked]
+
+
+class ProjectMatcher:
+    """Держит ProjectSkillIndex прогретым между запросами"""
+
+    def __init__(self, max_age: float = PROJECT_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._index: Optional[ProjectSkillIndex] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_index(self, session: Session) -> ProjectSkillIndex:
+        # Запрос к БД выполняется без блокировки: в асинхронном API этот код
+        # работает через run_sync на потоке event loop, и ожидание блокировки
+        # во время чужого запроса к БД остановило бы весь цикл
+        with self._lock:
+            if self._index is not None and time.monotonic() - self._built_at <= self.max_age:
+                return self._index
+            generation = self._generation
+        index = ProjectSkillIndex.build(session)
+        with self._lock:
+            # Если индекс инвалидировали во время построения, не сохраняем устаревший
+            if generation == self._generation:
+                self._index = index
+                self._built_at = time.monotonic()
+        return index
+
+    def invalidate(self):
+        """Сбрасывает индекс; его нужно вызывать после изменения навыков проектов"""
+        with self._lock:
+            self._index = None
+            self._generation += 1
+
+
+project_matcher = ProjectMatcher()
@@ -23,12 +23,7 @@ load_dotenv()
 config = context.config
 
 # Override the sqlalchemy.url with the one from environment variables
-username = os.getenv("DB_USERNAME", "postgres")
-password = os.getenv("DB_PASSWORD", "")
-host = os.getenv("DB_HOST", "localhost")
-database = os.getenv("DB_NAME", "web_team_finder")
-
-db_url = f'postgresql://{username}:{password}@{host}/{database}'
+from db_config import db_url
 config.set_main_option("sqlalchemy.url", db_url)
 
 # Interpret the config file for Python logging.
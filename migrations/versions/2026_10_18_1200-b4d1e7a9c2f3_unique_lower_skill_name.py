@@ -0,0 +1,33 @@
+"""Unique index on lower(skill.name)
+
+Revision ID: b4d1e7a9c2f3
+Revises: 69c30e808464
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d1e7a9c2f3'
+down_revision: Union[str, None] = '69c30e808464'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Make skill names unique case-insensitively.
+
+    Existing skills that differ only by case must be merged before upgrading.
+    """
+    op.create_index(
+        'ix_skill_name_lower', 'skill', [sa.text('lower(name)')], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Drop the case-insensitive skill name index."""
+    op.drop_index('ix_skill_name_lower', table_name='skill')
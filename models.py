@@ -3,6 +3,7 @@ from enum import Enum
 from typing import List, Optional
 from pydantic import EmailStr
 
+from sqlalchemy import Index, func
 from sqlmodel import Field, SQLModel, Relationship
 from passlib.context import CryptContext
 from dotenv import load_dotenv
@@ -103,6 +104,10 @@ class TaskResponse(TaskBase):
     project: Optional[ProjectBase] = None
     assigned_user: Optional[UserBase] = None
 
+class ProjectMatch(ProjectBase):
+    id: int
+    match_score: float
+
 
 # Существующие модели связей
 class UserSkillLink(SQLModel, table=True):
@@ -136,6 +141,9 @@ class Skill(SQLModel, table=True):
     users: List["User"] = Relationship(back_populates="skills", link_model=UserSkillLink)
     projects: List["Project"] = Relationship(link_model=ProjectSkillLink)
 
+# Имя навыка уникально без учёта регистра; по этому индексу парсеры делают ON CONFLICT DO NOTHING
+Index("ix_skill_name_lower", func.lower(Skill.name), unique=True)
+
 class User(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     username: str = Field(index=True, unique=True)
@@ -0,0 +1,65 @@
+"""Курсорная пагинация для списочных эндпоинтов."""
+import base64
+import json
+import os
+from typing import Generic, List, Optional, TypeVar
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+load_dotenv()
+
+DEFAULT_PAGE_SIZE = int(os.getenv("API_DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(*values) -> str:
+    """Упаковывает значения ключа последнего элемента в непрозрачную строку"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Распаковывает курсор, созданный encode_cursor, приводя значения к ``types``"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(type_(value) for type_, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_paginate(statement, key_column, cursor: Optional[str], limit: int):
+    """Ограничивает запрос одной страницей по возрастанию ключа ``key_column``.
+
+    Вместо OFFSET используется условие ``key > последний ключ``, поэтому
+    стоимость запроса не зависит от номера страницы. Выбирается ``limit + 1``
+    строк, чтобы build_page узнал, есть ли следующая страница.
+    """
+    if cursor:
+        (last_key,) = decode_cursor(cursor, int)
+        statement = statement.where(key_column > last_key)
+    return statement.order_by(key_column).limit(limit + 1)
+
+
+def build_page(rows, limit: int, key: str = "id") -> Page:
+    """Собирает страницу из результата запроса keyset_paginate"""
+    rows = list(rows)
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(getattr(items[-1], key))
+    return Page(items=items, next_cursor=next_cursor)
@@ -0,0 +1,102 @@
+"""Парсер навыков из вакансий с выбором режима параллелизма.
+
+    python -m parsers --mode thread --start 0 --end 1500 --workers 10
+    python -m parsers --mode process --workers 4 --chunk-size 25
+    python -m parsers --mode async --start 140000 --end 140570
+    python -m parsers --mode async --start 0 --end 2000000 --workers 100 --rate 200
+    python -m parsers --mode hybrid --workers 50 --processes 4
+    python -m parsers --mode async --workers 200 --no-adaptive
+    python -m parsers --mode async --start 0 --end 2000000 --ledger crawl.sqlite3 --resume
+    python -m parsers --mode process --cache .cache/jobs --cache-max-age 3600
+    python -m parsers --mode async --base-url http://127.0.0.1:8080   # см. python -m parsers.mock_api
+    python -m parsers --mode hybrid --output jobs.jsonl.gz --no-db     # загрузка: python -m parsers.jsonl
+    python -m parsers --mode thread --timings-json timings.json        # время этапов, p50/p95/p99
+    python -m parsers --mode async --workers 200 --log-level WARNING   # только ошибки
+"""
+import argparse
+import contextlib
+
+from parsers import stage_timings
+from parsers.executors import EXECUTORS, PROCESS_CHUNK_SIZE, format_report
+from parsers.jsonl import JsonlSink
+from parsers.ledger import CRAWL_LEDGER_PATH, CrawlLedger
+from parsers.logs import PARSER_LOG_LEVEL, PARSER_LOG_SAMPLE, configure_logging, log_level_argument
+from parsers.pipeline import JOBS_API_BASE_URL, set_base_url
+from parsers.response_cache import RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_AGE, ResponseCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=sorted(EXECUTORS), default="async", help="способ параллелизма")
+    parser.add_argument("--start", type=int, default=0, help="первый ID вакансии")
+    parser.add_argument("--end", type=int, default=1500, help="последний ID вакансии (включительно)")
+    parser.add_argument("--base-url", default=JOBS_API_BASE_URL,
+                        help="адрес API вакансий (JOBS_API_BASE_URL), например локального parsers.mock_api")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="потоков, процессов или соединений к API (по умолчанию зависит от режима)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="не больше стольких запросов к API в секунду в режимах async и hybrid")
+    parser.add_argument("--adaptive", action=argparse.BooleanOptionalAction, default=True,
+                        help="в режимах async и hybrid подстраивать число одновременных запросов под ответы API "
+                             "(AIMD, до --workers)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="процессов для разбора вакансий в режиме hybrid (по умолчанию по числу ядер)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help=f"ID в одной пачке для процесса в режиме process (по умолчанию {PROCESS_CHUNK_SIZE})")
+    parser.add_argument("--ledger", nargs="?", const=CRAWL_LEDGER_PATH, default=None,
+                        help=f"записывать итог по каждому ID в журнал обхода (по умолчанию {CRAWL_LEDGER_PATH})")
+    parser.add_argument("--resume", action="store_true",
+                        help="пропустить ID, уже обработанные по журналу; повторить упавшие с ошибкой")
+    parser.add_argument("--cache", nargs="?", const=RESPONSE_CACHE_DIR, default=None,
+                        help=f"кэшировать ответы API на диске (по умолчанию в {RESPONSE_CACHE_DIR})")
+    parser.add_argument("--cache-max-age", type=float, default=RESPONSE_CACHE_MAX_AGE,
+                        help="сколько секунд ответ из кэша считается свежим; потом он перепроверяется")
+    parser.add_argument("--output", help="выгрузить активные вакансии в JSONL (.gz — со сжатием)")
+    parser.add_argument("--timings", action="store_true",
+                        help="замерять этапы обработки вакансий и вывести p50/p95/p99 по каждому")
+    parser.add_argument("--timings-json", metavar="PATH",
+                        help="то же и сохранить сводку и гистограммы этапов в JSON")
+    parser.add_argument("--log-level", type=log_level_argument, default=PARSER_LOG_LEVEL,
+                        help="уровень журнала событий: DEBUG, INFO, WARNING, ERROR (PARSER_LOG_LEVEL)")
+    parser.add_argument("--log-sample", type=int, default=PARSER_LOG_SAMPLE,
+                        help="из повторяющихся событий (404, неактивные, обработанные вакансии) выводить "
+                             "каждое N-е после первых десяти; 1 — все (PARSER_LOG_SAMPLE)")
+    parser.add_argument("--no-db", action="store_true",
+                        help="не записывать навыки в БД, только извлекать (обычно вместе с --output)")
+    args = parser.parse_args()
+    if args.resume and not args.ledger:
+        args.ledger = CRAWL_LEDGER_PATH
+
+    set_base_url(args.base_url)
+    timings = stage_timings.enable() if args.timings or args.timings_json else None
+    options = {"workers": args.workers} if args.workers else {}
+    if args.mode in ("async", "hybrid"):
+        options["adaptive"] = args.adaptive
+        if args.rate:
+            options["rate"] = args.rate
+    if args.mode == "hybrid" and args.processes:
+        options["processes"] = args.processes
+    if args.mode == "process" and args.chunk_size:
+        options["chunk_size"] = args.chunk_size
+    if args.cache:
+        options["cache"] = ResponseCache(args.cache, max_age=args.cache_max_age)
+    if args.no_db:
+        options["persist"] = False
+    job_ids = range(args.start, args.end + 1)
+    with contextlib.ExitStack() as stack:
+        if args.output:
+            options["sink"] = stack.enter_context(JsonlSink(args.output, append=args.resume))
+        ledger = stack.enter_context(CrawlLedger(args.ledger)) if args.ledger else None
+        if ledger is not None and args.resume:
+            job_ids = ledger.pending(job_ids)
+        with configure_logging(args.log_level, args.log_sample):
+            report = EXECUTORS[args.mode](job_ids, ledger=ledger, **options)
+        print(format_report(report))
+        if args.timings_json:
+            stage_timings.dump_json(args.timings_json, stage_timings.run_data(report, timings))
+        if ledger is not None:
+            print(f"Журнал обхода {args.ledger}: {ledger.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Обход ID вакансий фиксированным числом asyncio-воркеров.
+
+Вместо отдельной задачи на каждый ID и gather по всему диапазону ID
+подаются в ограниченную очередь, её разбирают ``concurrency`` воркеров, а
+результаты отдаются вызывающему коду по мере готовности. Если потребитель
+не успевает, воркеры ждут, поэтому память не зависит от длины диапазона.
+Частоту запросов при необходимости ограничивает TokenBucket, а число
+одновременных запросов подстраивает под возможности API AdaptiveLimiter.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+_DONE = object()
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """В среднем не больше ``rate`` запросов в секунду, всплеск до ``burst``"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate должен быть больше нуля")
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Ожидающие проходят по очереди, в порядке вызова
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def crawl(job_ids: Iterable[int], handler: Callable[[int], Awaitable[Any]], concurrency: int = 10,
+                rate_limiter: Optional[TokenBucket] = None,
+                queue_size: Optional[int] = None) -> AsyncIterator[Tuple[int, Any]]:
+    """Вызывает ``handler(job_id)`` для каждого ID и отдаёт пары (job_id, результат).
+
+    Порядок пар — порядок завершения, а не ID. Исключение из handler
+    пишется в журнал, а результатом считается None. ``job_ids`` читается лениво,
+    так что подойдёт и range на миллионы ID, и генератор; исключение из него
+    (например, из ``CrawlLedger.pending``) поднимается из ``crawl`` после того,
+    как воркеры доработают уже выданные ID.
+    """
+    queue_size = queue_size or concurrency * 2
+    pending: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    finished: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    async def produce():
+        try:
+            for job_id in job_ids:
+                await pending.put(job_id)
+        finally:
+            # И при ошибке в job_ids, иначе воркеры и потребитель ждали бы вечно.
+            # При отмене не нужно: воркеров отменяют вместе с производителем
+            if not asyncio.current_task().cancelling():
+                for _ in range(concurrency):
+                    await pending.put(_DONE)
+
+    async def work():
+        while (job_id := await pending.get()) is not _DONE:
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            try:
+                result = await handler(job_id)
+            except Exception as e:
+                logger.warning("Ошибка при обработке вакансии %s: %s", job_id, e)
+                result = None
+            await finished.put((job_id, result))
+        await finished.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    tasks = [producer] + [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        running = concurrency
+        while running:
+            item = await finished.get()
+            if item is _DONE:
+                running -= 1
+            else:
+                yield item
+        # Все воркеры получили _DONE, значит производитель завершился; его ошибку отдаём вызывающему
+        await producer
+    finally:
+        # Потребитель мог выйти из цикла раньше: останавливаем воркеров
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class AdaptiveLimiter:
+    """AIMD-ограничение числа одновременных запросов.
+
+    Каждый успешный ответ прибавляет к лимиту 1/limit (в сумме +1 за «круг»
+    запросов), ответ 429/503 умножает его на ``backoff``. Снижение — не чаще
+    раза за круг: ответы на запросы, начатые до предыдущего снижения, его не
+    повторяют. Retry-After приостанавливает выдачу новых слотов до указанного
+    времени. Так параллелизм сходится к тому, что реально выдерживает API.
+    """
+
+    def __init__(self, initial: int, maximum: Optional[int] = None, minimum: int = 1, backoff: float = 0.5):
+        self.minimum = minimum
+        self.maximum = max(maximum or initial, minimum)
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.backoff = backoff
+        self.in_flight = 0
+        self.lowest = self.limit
+        self.throttled = 0
+        self._epoch = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> int:
+        """Ждёт свободный слот; возвращает номер круга для ``release``"""
+        async with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._condition.wait(), pause)
+                    continue
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return self._epoch
+                await self._condition.wait()
+
+    async def release(self, epoch: int, throttled: bool = False, retry_after: Optional[float] = None,
+                      failed: bool = False):
+        """Освобождает слот; ``failed`` — ошибка соединения, лимит не меняется"""
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                if epoch == self._epoch:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self.lowest = min(self.lowest, self.limit)
+                    self._epoch += 1
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            elif not failed:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 1),
+            "lowest": round(self.lowest, 1),
+            "maximum": self.maximum,
+            "throttled": self.throttled,
+        }
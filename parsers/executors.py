@@ -0,0 +1,600 @@
+"""Способы запуска конвейера parsers/pipeline.py: потоки, процессы, asyncio.
+
+Каждый исполнитель принимает список ID вакансий и возвращает отчёт о
+прогоне в одном формате, поэтому режимы можно сравнивать на одной и той же
+нагрузке (см. python -m parsers --help).
+"""
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from async_connection import async_engine, async_session_factory
+from connection import engine
+from db_config import create_db_engine
+from parsers.crawler import AdaptiveLimiter, TokenBucket, crawl
+from parsers.jsonl import JsonlSink
+from parsers.ledger import STATUS_ERROR, STATUS_INACTIVE, STATUS_NOT_FOUND, CrawlLedger
+from parsers.pipeline import (
+    JobOutcome, RetryingHttpSession, close_http_sessions, fetch_job_async, http_stats, init_parse_process,
+    log_parsed, make_async_http_session, parse_job, parse_job_async, parse_job_batch
+)
+from parsers import stage_timings
+from parsers.logs import init_worker_logging, worker_logging
+from parsers.response_cache import ResponseCache, format_cache_stats
+from parsers.skill_cache import (
+    AsyncKnownSkills, KnownSkills, SharedKnownSkills, format_stats,
+    load_known_skills, load_known_skills_async
+)
+from parsers.skill_store import AsyncSkillWriter, SkillWriter
+
+MODE_TITLES = {
+    "thread": "threading",
+    "process": "multiprocessing",
+    "async": "asyncio",
+    "hybrid": "asyncio + multiprocessing",
+}
+HYBRID_BATCH_SIZE = 20
+# С адаптивным параллелизмом asyncio-режимы начинают со стольких запросов и растут до workers
+ADAPTIVE_INITIAL_LIMIT = 10
+# Столько задач на воркер держим поданными в пул, остальные ID ещё не прочитаны
+IN_FLIGHT_PER_WORKER = 2
+
+logger = logging.getLogger(__name__)
+
+
+class _Tally:
+    """Счётчики прогона; сами результаты не храним, чтобы память не росла с диапазоном.
+
+    Если задан ``sink``, активные вакансии пишутся в JSONL. Если задан
+    ``ledger``, итоги ID копятся и попадают в журнал обхода только в
+    контрольной точке (``_checkpoint``), после того как навыки и строки
+    JSONL этих вакансий сброшены на диск. Иначе при падении журнал мог бы
+    пометить done вакансию, навыки которой остались в буфере, и --resume
+    её бы уже не запросил.
+    """
+
+    def __init__(self, ledger: Optional[CrawlLedger] = None, sink: Optional[JsonlSink] = None):
+        self.ledger = ledger
+        self.sink = sink
+        self.jobs = 0
+        self.parsed = 0
+        self.skills_found = 0
+        self.statuses: Dict[str, int] = {}
+        self._unsaved: List[JobOutcome] = []
+
+    def add(self, outcome: JobOutcome):
+        self.jobs += 1
+        self.statuses[outcome.status] = self.statuses.get(outcome.status, 0) + 1
+        if outcome.result is not None:
+            self.parsed += 1
+            self.skills_found += len(outcome.result['skills'])
+        if self.sink is not None and outcome.result is not None:
+            self.sink.write(outcome.result)
+        if self.ledger is not None:
+            self._unsaved.append(outcome)
+
+    def checkpoint_due(self) -> bool:
+        return self.ledger is not None and len(self._unsaved) >= self.ledger.batch_size
+
+    def take_unsaved(self) -> List[JobOutcome]:
+        """Итоги, ещё не записанные в журнал; их навыки к этому моменту уже в буфере писателя"""
+        outcomes, self._unsaved = self._unsaved, []
+        return outcomes
+
+    def add_unsaved(self, outcomes: List[JobOutcome]):
+        """Итоги, посчитанные в процессе пула (навыки он уже записал): в журнал — со следующей точкой"""
+        if self.ledger is not None:
+            self._unsaved.extend(outcomes)
+
+    def return_unsaved(self, outcomes: List[JobOutcome]):
+        """Возвращает итоги, чьи навыки не удалось записать: в журнал они попадут со следующей точкой"""
+        self._unsaved[:0] = outcomes
+
+    def save(self, outcomes: List[JobOutcome]):
+        """Сбрасывает JSONL и записывает ``outcomes`` в журнал; навыки должны быть уже в БД"""
+        if self.sink is not None:
+            self.sink.flush()
+        if self.ledger is not None:
+            for outcome in outcomes:
+                self.ledger.record(outcome.job_id, outcome.status, outcome.error)
+            self.ledger.flush()
+
+    def merge(self, other: "_Tally"):
+        self.jobs += other.jobs
+        self.parsed += other.parsed
+        self.skills_found += other.skills_found
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+    def __getstate__(self):
+        # Из процесса в родителя возвращаются только счётчики
+        return {**self.__dict__, "ledger": None, "sink": None}
+
+
+def _writer_totals(skill_writer) -> Tuple[int, int, Optional[Dict]]:
+    """Добавлено навыков, запросов к БД и статистика кэша навыков; без записи в БД — нули"""
+    if skill_writer is None:
+        return 0, 0, None
+    return len(skill_writer.inserted), skill_writer.batches, skill_writer.known_skills.stats()
+
+
+def _checkpoint(tally: _Tally, skill_writer: Optional[SkillWriter]):
+    """Контрольная точка: навыки в БД, затем JSONL и журнал обхода"""
+    outcomes = tally.take_unsaved()
+    try:
+        if skill_writer is not None:
+            skill_writer.flush()
+    except BaseException:
+        tally.return_unsaved(outcomes)
+        raise
+    tally.save(outcomes)
+
+
+async def _checkpoint_async(tally: _Tally, skill_writer: Optional[AsyncSkillWriter]):
+    # Итоги забираем до await: вакансии, учтённые во время записи, дождутся следующей точки
+    outcomes = tally.take_unsaved()
+    try:
+        if skill_writer is not None:
+            await skill_writer.flush()
+    except BaseException:
+        tally.return_unsaved(outcomes)
+        raise
+    tally.save(outcomes)
+
+
+def _report(mode: str, tally: _Tally, inserted: int, db_batches: int, cache: Optional[Dict], elapsed: float,
+            http: Optional[Dict[str, int]] = None, responses: Optional[Dict[str, int]] = None,
+            limiter: Optional[Dict[str, Any]] = None,
+            workers: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    timings = stage_timings.current()
+    return {
+        "mode": mode,
+        "jobs": tally.jobs,
+        "parsed": tally.parsed,
+        "skills_found": tally.skills_found,
+        "statuses": tally.statuses,
+        "inserted": inserted,
+        "db_batches": db_batches,
+        "cache": cache,
+        "elapsed": elapsed,
+        "http": http,
+        "responses": responses,
+        "limiter": limiter,
+        "workers": workers,
+        "stages": timings.summary(elapsed) if timings is not None else None,
+        "output": tally.sink.path if tally.sink is not None else None,
+    }
+
+
+def _format_http(http: Dict[str, int]) -> str:
+    reused = http['requests'] - http['connections']
+    share = reused / http['requests'] * 100 if http['requests'] else 0
+    return (
+        f"HTTP: {http['requests']} запросов через {http['sessions']} сессий, "
+        f"новых соединений {http['connections']}, keep-alive {reused} ({share:.0f}%)"
+    )
+
+
+def _format_limiter(limiter: Dict[str, Any]) -> str:
+    line = f"Повторов запросов: {limiter['retries']}"
+    if "limit" in limiter:
+        line += (
+            f", параллелизм: {limiter['limit']} в конце, минимум {limiter['lowest']} из {limiter['maximum']}, "
+            f"ответов 429/503: {limiter['throttled']}"
+        )
+    return line
+
+
+def _format_workers(workers: Dict[str, Dict[str, Any]], elapsed: float) -> str:
+    lines = ["Загрузка процессов:"]
+    for name, worker in sorted(workers.items()):
+        share = worker['busy'] / elapsed * 100 if elapsed else 0
+        lines.append(
+            f"  {name}: {worker['jobs']} вакансий в {worker['chunks']} пачках, "
+            f"занят {worker['busy']:.2f} с ({share:.0f}%)"
+        )
+    return "\n".join(lines)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Время выполнения ({MODE_TITLES[report['mode']]}): {report['elapsed']:.2f} секунд",
+        f"Всего обработано вакансий: {report['jobs']}, из них активных: {report['parsed']}, "
+        f"не найдено: {report['statuses'].get(STATUS_NOT_FOUND, 0)}, "
+        f"неактивных: {report['statuses'].get(STATUS_INACTIVE, 0)}, "
+        f"с ошибкой: {report['statuses'].get(STATUS_ERROR, 0)}",
+    ]
+    if report['cache'] is not None:
+        lines.append(f"Добавлено новых навыков: {report['inserted']} за {report['db_batches']} запросов к БД")
+        lines.append(format_stats(report['cache']))
+    else:
+        lines.append("Навыки в БД не записывались")
+    if report.get('output'):
+        lines.append(f"Вакансии выгружены в {report['output']}")
+    if report.get('http'):
+        lines.append(_format_http(report['http']))
+    if report.get('responses'):
+        lines.append(format_cache_stats(report['responses']))
+    if report.get('limiter'):
+        lines.append(_format_limiter(report['limiter']))
+    if report.get('workers'):
+        lines.append(_format_workers(report['workers'], report['elapsed']))
+    if report.get('stages'):
+        lines.append(stage_timings.format_stages(report['stages']))
+    return "\n".join(lines)
+
+
+def _bounded_map(executor: Executor, func: Callable, items: Iterable, window: int) -> Iterator[Any]:
+    """Как executor.map, но задач в работе не больше ``window``, а результаты — по мере готовности.
+
+    ``items`` читается в вызывающем потоке и лениво, поэтому длинный
+    диапазон или CrawlLedger.pending не превращается целиком в futures.
+    """
+    items = iter(items)
+    pending = set()
+    while True:
+        for item in islice(items, window - len(pending)):
+            pending.add(executor.submit(func, item))
+        if not pending:
+            return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+# Потоки
+
+def run_threads(job_ids: Iterable[int], workers: int = 10, ledger: Optional[CrawlLedger] = None,
+                cache: Optional[ResponseCache] = None, sink: Optional[JsonlSink] = None,
+                persist: bool = True) -> Dict[str, Any]:
+    """Пул потоков; буфер навыков и кэш общие для всех потоков"""
+    start_time = time.perf_counter()
+    skill_writer = SkillWriter(engine, known_skills=KnownSkills(load_known_skills(engine))) if persist else None
+    # Итоги собирает основной поток, поэтому журнал и JSONL пишутся из одного потока
+    tally = _Tally(ledger, sink)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for outcome in _bounded_map(
+                executor, lambda job_id: parse_job(job_id, skill_writer, cache=cache), job_ids,
+                workers * IN_FLIGHT_PER_WORKER,
+            ):
+                tally.add(outcome)
+                if tally.checkpoint_due():
+                    _checkpoint(tally, skill_writer)
+    finally:
+        # И при ошибке или Ctrl-C: сохраняем уже обработанное, журнал — последним
+        _checkpoint(tally, skill_writer)
+    return _report(
+        "thread", tally, *_writer_totals(skill_writer), time.perf_counter() - start_time, close_http_sessions(),
+        cache.stats() if cache else None,
+    )
+
+
+# Процессы
+
+# Столько ID процесс берёт из общей очереди за раз: мелкие пачки выравнивают
+# нагрузку, крупные экономят на передаче между процессами
+PROCESS_CHUNK_SIZE = 25
+
+_process_engine = None
+_process_writer: Optional[SkillWriter] = None
+_process_track_outcomes = False
+_process_cache: Optional[ResponseCache] = None
+_process_keep_results = False
+
+
+def _init_process(db_url, known_skills: Optional[SharedKnownSkills], track_outcomes: bool,
+                  cache: Optional[ResponseCache], keep_results: bool, timed: bool, log_config):
+    global _process_engine, _process_writer, _process_track_outcomes, _process_cache, _process_keep_results
+    init_worker_logging(log_config)
+    # Свой движок на процесс с одним соединением: оно живёт между пачками,
+    # а пул, унаследованный от родителя при fork, не трогаем
+    if known_skills is not None:
+        _process_engine = create_db_engine(db_url, pool_size=1, max_overflow=0)
+        _process_writer = SkillWriter(_process_engine, known_skills=known_skills)
+    _process_track_outcomes = track_outcomes
+    _process_cache = cache
+    _process_keep_results = keep_results
+    if timed:
+        stage_timings.enable()
+
+
+def _delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    return {key: value - before.get(key, 0) for key, value in after.items()}
+
+
+def _process_chunk(job_ids: Sequence[int]) -> Dict[str, Any]:
+    """Обрабатывает пачку ID; возвращает счётчики, прирост статистики, результаты для JSONL
+    и итоги ID для журнала обхода.
+
+    Навыки пачки записываются в БД до возврата, а JSONL и журнал пишет
+    основной процесс, так что журнал не опережает ни то, ни другое.
+    """
+    start_time = time.perf_counter()
+    # Писатель, сессия и кэш процесса живут между пачками, поэтому считаем только прирост
+    writer_before = _writer_totals(_process_writer)[:2]
+    http_before = http_stats()
+    responses_before = _process_cache.stats() if _process_cache else {}
+    tally, results, outcomes = _Tally(), [], []
+    for job_id in job_ids:
+        outcome = parse_job(job_id, _process_writer, cache=_process_cache)
+        tally.add(outcome)
+        if _process_keep_results and outcome.result is not None:
+            results.append(outcome.result)
+        if _process_track_outcomes:
+            outcomes.append(outcome._replace(result=None))
+    if _process_writer is not None:
+        _process_writer.flush()
+        _process_writer.known_skills.publish_stats()
+    inserted, batches, _ = _writer_totals(_process_writer)
+    timings = stage_timings.current()
+    return {
+        "worker": multiprocessing.current_process().name,
+        "busy": time.perf_counter() - start_time,
+        "tally": tally,
+        "inserted": inserted - writer_before[0],
+        "db_batches": batches - writer_before[1],
+        "http": _delta(http_before, http_stats()),
+        "responses": _delta(responses_before, _process_cache.stats() if _process_cache else {}),
+        "results": results,
+        "outcomes": outcomes,
+        "timings": timings.drain() if timings is not None else None,
+    }
+
+
+def _chunks(job_ids: Iterable[int], size: int) -> Iterator[List[int]]:
+    job_ids = iter(job_ids)
+    while chunk := list(islice(job_ids, size)):
+        yield chunk
+
+
+def run_processes(job_ids: Iterable[int], workers: Optional[int] = None, chunk_size: int = PROCESS_CHUNK_SIZE,
+                  ledger: Optional[CrawlLedger] = None, cache: Optional[ResponseCache] = None,
+                  sink: Optional[JsonlSink] = None, persist: bool = True) -> Dict[str, Any]:
+    """Пул процессов с общей очередью пачек по ``chunk_size`` ID, кэш навыков общий.
+
+    Освободившийся процесс сам берёт следующую пачку из очереди пула, поэтому
+    скопления 404 и неактивных вакансий не оставляют часть процессов без
+    работы, а время прогона определяется общим объёмом работы, а не самым
+    медленным диапазоном. ``job_ids`` читается в основном потоке (``_bounded_map``):
+    генератор ``ledger.pending`` работает со своим соединением SQLite, и в
+    очереди не больше ``IN_FLIGHT_PER_WORKER`` пачек на процесс. У каждого
+    процесса свои движок БД и HTTP-сессия на весь прогон. Навыки процесс
+    записывает в БД сам, а результаты для ``sink`` и итоги ID возвращает в
+    основной процесс; тот пишет JSONL и затем журнал обхода.
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    tally, inserted, db_batches = _Tally(ledger, sink), 0, 0
+    http = {'sessions': 0, 'requests': 0, 'connections': 0}
+    responses = {}
+    utilization: Dict[str, Dict[str, Any]] = {}
+    skills_cache = None
+    timings = stage_timings.current()
+    with (multiprocessing.Manager() if persist else contextlib.nullcontext()) as manager:
+        known_skills = SharedKnownSkills.create(manager, load_known_skills(engine)) if persist else None
+        with ProcessPoolExecutor(
+            workers, initializer=_init_process,
+            initargs=(
+                engine.url, known_skills, ledger is not None, cache, sink is not None,
+                timings is not None, worker_logging(),
+            ),
+        ) as pool:
+            try:
+                for chunk in _bounded_map(
+                    pool, _process_chunk, _chunks(job_ids, chunk_size), workers * IN_FLIGHT_PER_WORKER,
+                ):
+                    tally.merge(chunk["tally"])
+                    for result in chunk["results"]:
+                        sink.write(result)
+                    tally.add_unsaved(chunk["outcomes"])
+                    if tally.checkpoint_due():
+                        _checkpoint(tally, None)
+                    for key, value in chunk["http"].items():
+                        http[key] += value
+                    for key, value in chunk["responses"].items():
+                        responses[key] = responses.get(key, 0) + value
+                    inserted += chunk["inserted"]
+                    db_batches += chunk["db_batches"]
+                    if chunk["timings"] is not None:
+                        timings.merge(chunk["timings"])
+                    worker = utilization.setdefault(chunk["worker"], {"jobs": 0, "chunks": 0, "busy": 0.0})
+                    worker["jobs"] += chunk["tally"].jobs
+                    worker["chunks"] += 1
+                    worker["busy"] += chunk["busy"]
+            except BaseException:
+                # Пачки из очереди не ждём: останутся в журнале необработанными
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                # Навыки вернувшихся пачек уже в БД: сбрасываем JSONL и пишем их итоги в журнал
+                _checkpoint(tally, None)
+        if known_skills is not None:
+            skills_cache = known_skills.stats()
+    return _report(
+        "process", tally, inserted, db_batches, skills_cache, time.perf_counter() - start_time,
+        http, responses or None, workers=utilization,
+    )
+
+
+# asyncio
+
+async def _make_async_writer(persist: bool) -> Optional[AsyncSkillWriter]:
+    if not persist:
+        return None
+    return AsyncSkillWriter(
+        async_session_factory,
+        known_skills=AsyncKnownSkills(await load_known_skills_async(async_session_factory)),
+    )
+
+
+def _retrying_session(session, workers: int, adaptive: bool) -> RetryingHttpSession:
+    limiter = AdaptiveLimiter(min(workers, ADAPTIVE_INITIAL_LIMIT), maximum=workers) if adaptive else None
+    return RetryingHttpSession(session, limiter)
+
+
+async def _run_async(job_ids: Iterable[int], workers: int, rate: Optional[float], adaptive: bool,
+                     ledger: Optional[CrawlLedger], cache: Optional[ResponseCache], sink: Optional[JsonlSink],
+                     persist: bool):
+    skill_writer = await _make_async_writer(persist)
+    tally = _Tally(ledger, sink)
+    try:
+        try:
+            async with make_async_http_session(limit_per_host=workers) as session:
+                http_session = _retrying_session(session, workers, adaptive)
+                async for _, outcome in crawl(
+                    job_ids,
+                    lambda job_id: parse_job_async(http_session, job_id, skill_writer, cache),
+                    concurrency=workers,
+                    rate_limiter=TokenBucket(rate) if rate else None,
+                ):
+                    tally.add(outcome)
+                    if tally.checkpoint_due():
+                        await _checkpoint_async(tally, skill_writer)
+        finally:
+            await _checkpoint_async(tally, skill_writer)
+        return tally, skill_writer, http_session.stats()
+    finally:
+        await async_engine.dispose()
+
+
+def run_async(job_ids: Iterable[int], workers: int = 10, rate: Optional[float] = None, adaptive: bool = True,
+              ledger: Optional[CrawlLedger] = None, cache: Optional[ResponseCache] = None,
+              sink: Optional[JsonlSink] = None, persist: bool = True) -> Dict[str, Any]:
+    """``workers`` корутин разбирают очередь ID, результаты учитываются по мере готовности.
+
+    ``rate`` — не больше стольких запросов к API в секунду (по умолчанию без ограничения).
+    С ``adaptive`` одновременных запросов сначала ADAPTIVE_INITIAL_LIMIT, дальше
+    их число подстраивается по ответам API (AIMD), но не выше ``workers``.
+    """
+    start_time = time.perf_counter()
+    tally, skill_writer, limiter = asyncio.run(
+        _run_async(job_ids, workers, rate, adaptive, ledger, cache, sink, persist)
+    )
+    return _report(
+        "async", tally, *_writer_totals(skill_writer), time.perf_counter() - start_time,
+        responses=cache.stats() if cache else None, limiter=limiter,
+    )
+
+
+# asyncio + процессы
+
+async def _run_hybrid(job_ids: Iterable[int], workers: int, rate: Optional[float], adaptive: bool,
+                      processes: int, batch_size: int, ledger: Optional[CrawlLedger],
+                      cache: Optional[ResponseCache], sink: Optional[JsonlSink], persist: bool):
+    loop = asyncio.get_running_loop()
+    timings = stage_timings.current()
+    skill_writer = await _make_async_writer(persist)
+    tally = _Tally(ledger, sink)
+    # Не больше двух пачек на процесс в работе, иначе загрузка убегает вперёд разбора
+    in_flight = asyncio.Semaphore(processes * 2)
+    parse_tasks = set()
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    async def parse_and_persist(items):
+        try:
+            outcomes, batch_timings = await loop.run_in_executor(
+                pool, stage_timings.call_and_drain, parse_job_batch, items
+            )
+            if batch_timings is not None:
+                timings.merge(batch_timings)
+            for outcome in outcomes:
+                # Навыки — в буфер писателя до учёта итога: контрольная точка сначала сбрасывает их
+                if outcome.result is not None:
+                    if skill_writer is not None:
+                        await skill_writer.add(outcome.result['skills'])
+                    log_parsed(outcome.result)
+                tally.add(outcome)
+                if tally.checkpoint_due():
+                    await _checkpoint_async(tally, skill_writer)
+        finally:
+            in_flight.release()
+
+    async def submit_batch():
+        nonlocal batch
+        if batch:
+            await in_flight.acquire()
+            task = asyncio.create_task(parse_and_persist(batch))
+            parse_tasks.add(task)
+            task.add_done_callback(parse_tasks.discard)
+            batch = []
+
+    async def fetch(http_session, job_id):
+        """(итог, None), если разбирать нечего, иначе (None, данные вакансии)"""
+        try:
+            job_data = await fetch_job_async(http_session, job_id, cache)
+        except Exception as e:
+            logger.warning("Ошибка при загрузке вакансии %s: %s", job_id, e)
+            return JobOutcome(job_id, STATUS_ERROR, error=str(e)), None
+        if job_data is None:
+            return JobOutcome(job_id, STATUS_NOT_FOUND), None
+        return None, job_data
+
+    try:
+        try:
+            # spawn: не копируем в процессы работающий event loop и потоки драйвера БД
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_parse_process, initargs=(worker_logging(), timings is not None),
+            ) as pool:
+                async with make_async_http_session(limit_per_host=workers) as session:
+                    http_session = _retrying_session(session, workers, adaptive)
+                    async for job_id, (outcome, job_data) in crawl(
+                        job_ids,
+                        lambda job_id: fetch(http_session, job_id),
+                        concurrency=workers,
+                        rate_limiter=TokenBucket(rate) if rate else None,
+                    ):
+                        if outcome is not None:
+                            tally.add(outcome)
+                            if tally.checkpoint_due():
+                                await _checkpoint_async(tally, skill_writer)
+                            continue
+                        batch.append((job_id, job_data))
+                        if len(batch) >= batch_size:
+                            await submit_batch()
+                await submit_batch()
+                await asyncio.gather(*parse_tasks)
+        finally:
+            # При ошибке дожидаемся уже отправленных пачек, чтобы их итоги попали в журнал
+            await asyncio.gather(*parse_tasks, return_exceptions=True)
+            await _checkpoint_async(tally, skill_writer)
+        return tally, skill_writer, http_session.stats()
+    finally:
+        await async_engine.dispose()
+
+
+def run_hybrid(job_ids: Iterable[int], workers: int = 10, rate: Optional[float] = None, adaptive: bool = True,
+               processes: Optional[int] = None, batch_size: int = HYBRID_BATCH_SIZE,
+               ledger: Optional[CrawlLedger] = None, cache: Optional[ResponseCache] = None,
+               sink: Optional[JsonlSink] = None, persist: bool = True) -> Dict[str, Any]:
+    """Сеть на event loop, разбор HTML и поиск навыков — в пуле процессов.
+
+    Загрузка идёт так же, как в run_async (с теми же ``rate`` и ``adaptive``). Загруженные вакансии отправляются
+    в процессы пачками по ``batch_size``, чтобы расходы на передачу между
+    процессами делились на много вакансий. Сохранение навыков остаётся в
+    event loop основного процесса.
+    """
+    start_time = time.perf_counter()
+    tally, skill_writer, limiter = asyncio.run(
+        _run_hybrid(job_ids, workers, rate, adaptive, processes or os.cpu_count() or 1, batch_size, ledger,
+                    cache, sink, persist)
+    )
+    return _report(
+        "hybrid", tally, *_writer_totals(skill_writer), time.perf_counter() - start_time,
+        responses=cache.stats() if cache else None, limiter=limiter,
+    )
+
+
+EXECUTORS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "thread": run_threads,
+    "process": run_processes,
+    "async": run_async,
+    "hybrid": run_hybrid,
+}
@@ -0,0 +1,84 @@
+"""Получение текста из HTML-описаний вакансий.
+
+Полное дерево BeautifulSoup ради одного get_text() — самая дорогая часть
+обработки вакансии. Бэкенд выбирается автоматически: selectolax, если
+установлен, затем lxml (есть в зависимостях проекта), и BeautifulSoup как
+запасной вариант. Выбор можно задать переменной HTML_TEXT_BACKEND.
+Все бэкенды, как и BeautifulSoup, пропускают содержимое <script> и <style>.
+"""
+import os
+from typing import Callable, Dict
+
+from bs4 import BeautifulSoup
+
+
+def bs4_text(html: str) -> str:
+    return BeautifulSoup(html, 'html.parser').get_text()
+
+
+def _lxml_text():
+    import lxml.html
+    from lxml import etree
+
+    def lxml_text(html: str) -> str:
+        if not html.strip():
+            return html
+        try:
+            root = lxml.html.fragment_fromstring(html, create_parent=True)
+        except (etree.ParserError, ValueError):
+            # Например, управляющие символы, которые lxml не принимает
+            return bs4_text(html)
+        etree.strip_elements(root, 'script', 'style', with_tail=False)
+        return root.text_content()
+
+    return lxml_text
+
+
+def _selectolax_text():
+    from selectolax.parser import HTMLParser
+
+    def selectolax_text(html: str) -> str:
+        tree = HTMLParser(html)
+        tree.strip_tags(['script', 'style'])
+        return tree.root.text(separator='') if tree.root is not None else ''
+
+    return selectolax_text
+
+
+_LOADERS: Dict[str, Callable[[], Callable[[str], str]]] = {
+    'selectolax': _selectolax_text,
+    'lxml': _lxml_text,
+    'bs4': lambda: bs4_text,
+}
+BACKEND_PRIORITY = ('selectolax', 'lxml', 'bs4')
+
+
+def get_backend(name: str) -> Callable[[str], str]:
+    """Функция HTML -> текст для указанного бэкенда; ImportError, если он не установлен"""
+    if name not in _LOADERS:
+        raise ValueError(f"Неизвестный бэкенд {name!r}, доступны: {', '.join(_LOADERS)}")
+    return _LOADERS[name]()
+
+
+def available_backends() -> Dict[str, Callable[[str], str]]:
+    backends = {}
+    for name in BACKEND_PRIORITY:
+        try:
+            backends[name] = get_backend(name)
+        except ImportError:
+            pass
+    return backends
+
+
+def _select_backend():
+    name = os.getenv("HTML_TEXT_BACKEND")
+    if name:
+        return name, get_backend(name)
+    for name in BACKEND_PRIORITY:
+        try:
+            return name, get_backend(name)
+        except ImportError:
+            continue
+
+
+HTML_TEXT_BACKEND, html_to_text = _select_backend()
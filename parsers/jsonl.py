@@ -0,0 +1,178 @@
+"""Выгрузка разобранных вакансий в JSONL и загрузка навыков из него в БД.
+
+Парсер может писать каждую активную вакансию (job_id, title, company,
+skills) строкой JSON в файл вместо или вместе с записью в БД; файл с
+расширением .gz сжимается. Потом файл загружается в БД отдельно, и
+извлечение навыков не ждёт базу. Для PostgreSQL навыки пачкой идут через
+COPY во временную таблицу и одним INSERT ... SELECT ... ON CONFLICT DO
+NOTHING, для остальных СУБД — через SkillWriter.
+
+    python -m parsers --mode async --output jobs.jsonl.gz --no-db
+    python -m parsers.jsonl jobs.jsonl.gz --batch-size 5000
+"""
+import argparse
+import gzip
+import io
+import json
+import threading
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List
+
+import connection
+from parsers.skill_cache import KnownSkills
+from parsers.skill_store import SkillWriter, skill_rows
+
+JSONL_BUFFER_LINES = 1000
+LOAD_BATCH_SIZE = 5000
+
+
+def open_jsonl(path: str, mode: str) -> IO[str]:
+    """Текстовый файл; *.gz открывается через gzip"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+class JsonlSink:
+    """Построчная запись результатов в ``path``; строки копятся и пишутся пачками.
+
+    С ``append`` файл дописывается (для продолжения обхода); gzip-файл тогда
+    состоит из нескольких сжатых частей, и gzip читает его целиком.
+    """
+
+    def __init__(self, path: str, buffer_lines: int = JSONL_BUFFER_LINES, append: bool = False):
+        self.path = path
+        self.buffer_lines = buffer_lines
+        self.written = 0
+        self._file = open_jsonl(path, "a" if append else "w")
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def write(self, result: Dict[str, Any]):
+        line = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            self.written += 1
+            if len(self._buffer) >= self.buffer_lines:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open_jsonl(path, "r") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _copy_value(value: str) -> str:
+    # Текстовый формат COPY: экранируем обратную косую черту, табуляцию и переводы строк
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_skills(engine, skills: List[Dict[str, str]]) -> List[str]:
+    """COPY пачки навыков во временную таблицу и перенос в skill без дублей (PostgreSQL).
+
+    Имена приводятся к тому же виду, что и в SkillWriter (``skill_rows``),
+    чтобы оба способа загрузки писали одинаковые имена.
+    """
+    rows = skill_rows(skills)
+    if not rows:
+        return []
+    data = io.StringIO()
+    for row in rows:
+        data.write(f"{_copy_value(row['name'])}\t{_copy_value(row['description'])}\n")
+    data.seek(0)
+    raw_connection = engine.raw_connection()
+    try:
+        with raw_connection.cursor() as cursor:
+            cursor.execute("CREATE TEMP TABLE skill_import (name text, description text) ON COMMIT DROP")
+            cursor.copy_expert("COPY skill_import (name, description) FROM STDIN", data)
+            cursor.execute(
+                "INSERT INTO skill (name, description) SELECT name, description FROM skill_import "
+                "ON CONFLICT (lower(name)) DO NOTHING RETURNING name"
+            )
+            names = [name for name, in cursor.fetchall()]
+        raw_connection.commit()
+    except Exception:
+        raw_connection.rollback()
+        raise
+    finally:
+        raw_connection.close()
+    return names
+
+
+def load_jobs(engine, jobs: Iterable[Dict[str, Any]], batch_size: int = LOAD_BATCH_SIZE) -> Dict[str, Any]:
+    """Загружает навыки из результатов парсера в таблицу skill.
+
+    Повторы отсекаются ещё в памяти (KnownSkills), в БД уходят только
+    новые для этого прогона навыки, пачками по ``batch_size``.
+    """
+    start_time = time.perf_counter()
+    known_skills = KnownSkills()
+    stats = {"jobs": 0, "skills": 0, "inserted": 0, "batches": 0}
+    use_copy = engine.dialect.name == "postgresql"
+    writer = None if use_copy else SkillWriter(engine, batch_size=batch_size, known_skills=known_skills)
+    batch: List[Dict[str, str]] = []
+
+    def copy_batch():
+        nonlocal batch
+        if batch:
+            stats["inserted"] += len(copy_skills(engine, batch))
+            stats["batches"] += 1
+            batch = []
+
+    for job in jobs:
+        stats["jobs"] += 1
+        stats["skills"] += len(job["skills"])
+        if writer is not None:
+            writer.add(job["skills"])
+            continue
+        batch.extend(known_skills.filter_new(job["skills"]))
+        if len(batch) >= batch_size:
+            copy_batch()
+    if writer is not None:
+        writer.flush()
+        stats["inserted"], stats["batches"] = len(writer.inserted), writer.batches
+    else:
+        copy_batch()
+    stats["elapsed"] = time.perf_counter() - start_time
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="JSONL (или .jsonl.gz) из python -m parsers --output")
+    parser.add_argument("--batch-size", type=int, default=LOAD_BATCH_SIZE, help="навыков в одной пачке")
+    args = parser.parse_args()
+
+    stats = load_jobs(connection.engine, read_jsonl(args.path), batch_size=args.batch_size)
+    print(
+        f"Загружено вакансий: {stats['jobs']}, навыков в них: {stats['skills']}, "
+        f"добавлено новых: {stats['inserted']} за {stats['batches']} запросов к БД, "
+        f"{stats['elapsed']:.2f} с"
+    )
+
+
+if __name__ == "__main__":
+    main()
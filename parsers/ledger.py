@@ -0,0 +1,112 @@
+"""Журнал обхода: итог по каждому ID вакансии в отдельной SQLite-базе.
+
+Парсер записывает, чем закончилась обработка ID (done, 404, inactive,
+error), поэтому после падения можно продолжить с места остановки:
+``pending`` пропускает ID с окончательным итогом и возвращает только
+необработанные и упавшие с ошибкой. Журнал лежит в отдельном файле, а не в
+основной БД, чтобы не зависеть от её миграций и не нагружать её записью
+на каждую вакансию.
+"""
+import os
+import sqlite3
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CRAWL_LEDGER_PATH = os.getenv("CRAWL_LEDGER_PATH", "crawl_ledger.sqlite3")
+LEDGER_BATCH_SIZE = 500
+
+STATUS_DONE = "done"
+STATUS_NOT_FOUND = "404"
+STATUS_INACTIVE = "inactive"
+STATUS_ERROR = "error"
+# Такие ID при продолжении обхода повторно не запрашиваем
+FINAL_STATUSES = (STATUS_DONE, STATUS_NOT_FOUND, STATUS_INACTIVE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_ledger (
+    job_id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    error TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+_UPSERT = """
+INSERT INTO crawl_ledger (job_id, status, error, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (job_id) DO UPDATE SET
+    status = excluded.status,
+    error = excluded.error,
+    updated_at = excluded.updated_at,
+    attempts = crawl_ledger.attempts + 1
+"""
+
+
+class CrawlLedger:
+    """Журнал обхода в файле ``path``.
+
+    Записи копятся в памяти и сохраняются одной транзакцией каждые
+    ``batch_size`` записей и при ``flush``; при падении теряется не больше
+    одной пачки, и эти ID просто запросятся ещё раз. Один объект — для одного
+    потока; процессы открывают журнал каждый у себя (WAL позволяет им писать
+    в один файл по очереди).
+    """
+
+    def __init__(self, path: str = CRAWL_LEDGER_PATH, batch_size: int = LEDGER_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[Tuple[int, str, Optional[str], float]] = []
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    def record(self, job_id: int, status: str, error: Optional[str] = None):
+        self._buffer.append((job_id, status, error, time.time()))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        with self._connection:
+            self._connection.executemany(_UPSERT, batch)
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+    def pending(self, job_ids: Iterable[int], chunk_size: int = 500) -> Iterator[int]:
+        """ID из ``job_ids`` без окончательного итога в журнале; читает лениво, пачками"""
+        job_ids = iter(job_ids)
+        status_marks = ", ".join("?" * len(FINAL_STATUSES))
+        while chunk := list(islice(job_ids, chunk_size)):
+            rows = self._connection.execute(
+                f"SELECT job_id FROM crawl_ledger WHERE status IN ({status_marks}) "
+                f"AND job_id IN ({', '.join('?' * len(chunk))})",
+                (*FINAL_STATUSES, *chunk),
+            )
+            finished = {job_id for job_id, in rows}
+            yield from (job_id for job_id in chunk if job_id not in finished)
+
+    def summary(self) -> Dict[str, int]:
+        self.flush()
+        return dict(self._connection.execute("SELECT status, count(*) FROM crawl_ledger GROUP BY status"))
+
+    def __getstate__(self):
+        # В процессы передаём только путь, соединение каждый открывает сам
+        return {"path": self.path, "batch_size": self.batch_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
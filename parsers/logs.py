@@ -0,0 +1,143 @@
+"""Журнал событий парсера через очередь.
+
+Раньше каждая вакансия (в том числе каждый 404) печаталась print из
+десятков потоков, процессов и корутин, и при большом параллелизме они
+упирались в общий stdout. Теперь события пишутся в логгер ``parsers``.
+QueueHandler только кладёт запись в очередь и не ждёт вывода, поэтому
+его можно вызывать и из event loop. Выводит записи отдельный поток
+QueueListener. Процессы пула отправляют записи в основной процесс через
+multiprocessing.Queue (``worker_logging`` / ``init_worker_logging``).
+
+Повторяющиеся события (записи с ``extra={"sample": ключ}``: 404,
+неактивные и обработанные вакансии) прореживаются SamplingFilter ещё до
+очереди; счётчики у каждого процесса свои. Уровень и частоту выборки
+задают PARSER_LOG_LEVEL и PARSER_LOG_SAMPLE или флаги ``--log-level`` и
+``--log-sample``.
+"""
+import argparse
+import contextlib
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PARSER_LOG_LEVEL = os.getenv("PARSER_LOG_LEVEL", "INFO")
+PARSER_LOG_SAMPLE = int(os.getenv("PARSER_LOG_SAMPLE", "100"))
+LOG_FORMAT = "%(asctime)s %(levelname)s %(processName)s: %(message)s"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+# Столько первых событий каждого вида выводится без прореживания
+SAMPLE_FIRST = 10
+
+logger = logging.getLogger("parsers")
+
+_worker_config: Optional[Tuple[multiprocessing.Queue, int, int]] = None
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает первые ``first`` событий каждого вида, дальше — каждое ``every``-е.
+
+    Вид события — атрибут ``sample`` записи; записи без него (ошибки)
+    проходят всегда.
+    """
+
+    def __init__(self, every: int = PARSER_LOG_SAMPLE, first: int = SAMPLE_FIRST):
+        super().__init__()
+        self.every = max(every, 1)
+        self.first = first
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None or self.every == 1:
+            return True
+        with self._lock:
+            seen = self._seen[key] = self._seen.get(key, 0) + 1
+        if seen <= self.first:
+            return True
+        if seen % self.every:
+            return False
+        record.msg = f"{record.msg} (таких событий уже {seen}, выводится каждое {self.every}-е)"
+        return True
+
+
+def parse_log_level(value: str) -> int:
+    """Уровень журнала по имени без учёта регистра; ValueError для неизвестного имени"""
+    name = value.strip().upper()
+    if name not in LOG_LEVELS:
+        raise ValueError(f"неизвестный уровень журнала {value!r}, допустимы: {', '.join(LOG_LEVELS)}")
+    return logging.getLevelName(name)
+
+
+def log_level_argument(value: str) -> int:
+    """``type`` для --log-level: argparse покажет ошибку использования, а не трассировку.
+
+    argparse применяет ``type`` и к строковому значению по умолчанию, так что
+    неверный PARSER_LOG_LEVEL тоже даёт понятную ошибку.
+    """
+    try:
+        return parse_log_level(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _install(target: Union[queue.SimpleQueue, multiprocessing.Queue], level: int, sample_every: int):
+    handler = logging.handlers.QueueHandler(target)
+    handler.addFilter(SamplingFilter(sample_every))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+@contextlib.contextmanager
+def configure_logging(level: Union[int, str] = PARSER_LOG_LEVEL,
+                      sample_every: int = PARSER_LOG_SAMPLE) -> Iterator[None]:
+    """Направляет логгер ``parsers`` в stderr через очередь на время блока.
+
+    На выходе дожидается, пока очередь будет выведена, поэтому отчёт,
+    напечатанный после блока, не перемешается с событиями.
+    """
+    global _worker_config
+    level = parse_log_level(level) if isinstance(level, str) else level
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    local_queue: queue.SimpleQueue = queue.SimpleQueue()
+    # Очередь из spawn-контекста подходит и для fork-, и для spawn-процессов (hybrid)
+    process_queue: multiprocessing.Queue = multiprocessing.get_context("spawn").Queue()
+    listeners = [
+        logging.handlers.QueueListener(local_queue, handler),
+        logging.handlers.QueueListener(process_queue, handler),
+    ]
+    saved = logger.handlers[:], logger.level, logger.propagate
+    _install(local_queue, level, sample_every)
+    _worker_config = (process_queue, level, sample_every)
+    for listener in listeners:
+        listener.start()
+    try:
+        yield
+    finally:
+        _worker_config = None
+        logger.handlers[:], logger.level, logger.propagate = saved
+        for listener in listeners:
+            listener.stop()
+        process_queue.close()
+        process_queue.join_thread()
+
+
+def worker_logging() -> Optional[Tuple[multiprocessing.Queue, int, int]]:
+    """Что передать процессам пула для ``init_worker_logging``; None — журнал не настроен"""
+    return _worker_config
+
+
+def init_worker_logging(config: Optional[Tuple[multiprocessing.Queue, int, int]]):
+    """В процессе пула: записи уходят в очередь основного процесса"""
+    if config is not None:
+        _install(*config)
@@ -0,0 +1,211 @@
+"""Локальная замена API вакансий для воспроизводимых прогонов парсера.
+
+Отвечает на ``GET /api/jobs/{id}`` так же, как jobs.yourcodereview.com, но
+поведение задаётся настройками: распределение задержки, доля 404 и
+неактивных вакансий, доля ошибок 500 и обрывов соединения, лимит запросов
+в секунду с ответом 429 и Retry-After. Вакансии генерируются или берутся из
+записанного JSONL-файла (по объекту вакансии в строке, ID в поле ``id``).
+Все случайные решения зависят только от ``seed``, ID и номера попытки, а
+не от порядка запросов, поэтому без ``rate_limit`` прогоны повторяемы при
+любом параллелизме. Лимит запросов считается по часам, как у настоящего
+API: какие запросы получат 429, зависит от темпа клиента, и число ответов
+429 (а с ним и номера попыток) от прогона к прогону может отличаться.
+``GET /stats`` возвращает счётчики ответов.
+
+    python -m parsers.mock_api --port 8080 --latency 0.05 --latency-dist lognormal --error-rate 0.02
+    python -m parsers --base-url http://127.0.0.1:8080 --mode async
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import multiprocessing
+import random
+import socket
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+from aiohttp import web
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+TECHNOLOGIES = [
+    "Python", "Django", "FastAPI", "PostgreSQL", "Redis", "Docker", "Kubernetes", "Kafka",
+    "React", "TypeScript", "Go", "RabbitMQ", "Celery", "GraphQL", "AWS", "Terraform",
+]
+PARAGRAPH = (
+    "<p>Мы ищем разработчика в команду платформы. Стек: {a}, {b}, {c}. "
+    "Будет плюсом опыт с <b>{d}</b> и <i>{e}</i>; удалённая работа и гибкий график.</p>"
+)
+
+
+class MockApiConfig(NamedTuple):
+    latency: float = 0.05
+    latency_dist: str = "fixed"
+    not_found_ratio: float = 1 / 7
+    inactive_ratio: float = 0.2
+    error_rate: float = 0.0
+    reset_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    retry_after: float = 1.0
+    paragraphs: int = 20
+    recorded: Optional[str] = None
+    seed: int = 0
+
+
+def sample_latency(config: MockApiConfig, rng: random.Random) -> float:
+    """Задержка со средним ``config.latency``"""
+    if config.latency <= 0 or config.latency_dist == "fixed":
+        return max(config.latency, 0)
+    if config.latency_dist == "uniform":
+        return rng.uniform(0, 2 * config.latency)
+    if config.latency_dist == "exponential":
+        return rng.expovariate(1 / config.latency)
+    # Логнормальное с sigma=1: тяжёлый хвост, как у настоящих API
+    return rng.lognormvariate(math.log(config.latency) - 0.5, 1)
+
+
+def synthetic_job(config: MockApiConfig, job_id: int) -> Optional[Dict[str, Any]]:
+    """Вакансия для ID или None, если её «нет»"""
+    rng = random.Random(f"{config.seed}:{job_id}")
+    if rng.random() < config.not_found_ratio:
+        return None
+    description = "\n".join(
+        PARAGRAPH.format(**dict(zip("abcde", rng.sample(TECHNOLOGIES, 5)))) for _ in range(config.paragraphs)
+    )
+    return {
+        "id": job_id,
+        "active": rng.random() >= config.inactive_ratio,
+        "title": f"Вакансия {job_id}",
+        "company_name": f"Компания {rng.randint(1, 50)}",
+        "speciality": rng.choice(TECHNOLOGIES),
+        "description": description,
+    }
+
+
+def load_recorded(path: str) -> Dict[int, Dict[str, Any]]:
+    jobs = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                job = json.loads(line)
+                jobs[int(job["id"])] = job
+    return jobs
+
+
+def make_app(config: MockApiConfig) -> web.Application:
+    recorded = load_recorded(config.recorded) if config.recorded else None
+    attempts: Dict[int, int] = defaultdict(int)
+    stats: Counter = Counter()
+    bucket = {"tokens": config.rate_limit or 0, "updated": time.monotonic()}
+
+    def throttled() -> bool:
+        if not config.rate_limit:
+            return False
+        now = time.monotonic()
+        bucket["tokens"] = min(config.rate_limit, bucket["tokens"] + (now - bucket["updated"]) * config.rate_limit)
+        bucket["updated"] = now
+        if bucket["tokens"] < 1:
+            return True
+        bucket["tokens"] -= 1
+        return False
+
+    async def job(request: web.Request) -> web.StreamResponse:
+        job_id = int(request.match_info["job_id"])
+        attempts[job_id] += 1
+        rng = random.Random(f"{config.seed}:{job_id}:{attempts[job_id]}")
+        if throttled():
+            stats["429"] += 1
+            return web.json_response(
+                {"detail": "Too Many Requests"}, status=429,
+                headers={"Retry-After": str(math.ceil(config.retry_after))},
+            )
+        await asyncio.sleep(sample_latency(config, rng))
+        if rng.random() < config.reset_rate:
+            stats["reset"] += 1
+            request.transport.close()
+            return web.Response()
+        if rng.random() < config.error_rate:
+            stats["500"] += 1
+            return web.json_response({"detail": "Internal Server Error"}, status=500)
+        payload = recorded.get(job_id) if recorded is not None else synthetic_job(config, job_id)
+        if payload is None:
+            stats["404"] += 1
+            return web.json_response({"detail": "Not found"}, status=404)
+        etag = f'"{config.seed}-{job_id}"'
+        if request.headers.get("If-None-Match") == etag:
+            stats["304"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        stats["200"] += 1
+        return web.json_response(payload, headers={"ETag": etag})
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(dict(stats))
+
+    app = web.Application()
+    app.router.add_get("/api/jobs/{job_id}", job)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def serve(config: MockApiConfig, host: str = "127.0.0.1", port: int = 8080):
+    web.run_app(make_app(config), host=host, port=port, print=None)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f"API вакансий не запустился на порту {port}")
+
+
+@contextlib.contextmanager
+def running_mock_api(config: MockApiConfig = MockApiConfig()) -> Iterator[str]:
+    """Запускает сервер в отдельном процессе и отдаёт его базовый URL"""
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(config, "127.0.0.1", port), daemon=True)
+    server.start()
+    try:
+        wait_for_port(port)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main():
+    defaults = MockApiConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="средняя задержка ответа, с")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default=defaults.latency_dist)
+    parser.add_argument("--not-found-ratio", type=float, default=defaults.not_found_ratio, help="доля ID с 404")
+    parser.add_argument("--inactive-ratio", type=float, default=defaults.inactive_ratio,
+                        help="доля неактивных среди найденных вакансий")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="доля ответов 500")
+    parser.add_argument("--reset-rate", type=float, default=defaults.reset_rate, help="доля оборванных соединений")
+    parser.add_argument("--rate-limit", type=float, default=defaults.rate_limit,
+                        help="запросов в секунду, сверх — 429 с Retry-After")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after, help="значение Retry-After, с")
+    parser.add_argument("--paragraphs", type=int, default=defaults.paragraphs, help="абзацев в описании вакансии")
+    parser.add_argument("--recorded", help="JSONL с записанными вакансиями вместо синтетических")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    config = MockApiConfig(**{field: getattr(args, field) for field in MockApiConfig._fields})
+    print(f"API вакансий: http://{args.host}:{args.port}/api/jobs/{{id}}, счётчики: /stats")
+    serve(config, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""Этапы обработки одной вакансии: загрузка -> извлечение навыков -> сохранение.
+
+Этапы не зависят от способа параллелизма; потоки, процессы и asyncio
+(parsers/executors.py) только по-разному их запускают.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from parsers.crawler import AdaptiveLimiter
+from parsers.ledger import STATUS_DONE, STATUS_ERROR, STATUS_INACTIVE, STATUS_NOT_FOUND
+from parsers.response_cache import ResponseCache
+from parsers.skill_extractor import extract_skills_from_job
+from parsers.logs import init_worker_logging
+from parsers.stage_timings import enable as enable_stage_timings, stage
+
+load_dotenv()
+
+JOBS_API_BASE_URL = os.getenv("JOBS_API_BASE_URL", "https://jobs.yourcodereview.com")
+JOBS_API_URL = JOBS_API_BASE_URL.rstrip('/') + "/api/jobs/{job_id}"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+REQUEST_TIMEOUT = 10
+# Повторы в asyncio, как Retry у requests: те же статусы, экспоненциальная пауза с джиттером
+ASYNC_RETRY_ATTEMPTS = 4
+ASYNC_RETRY_BASE_DELAY = 0.5
+ASYNC_RETRY_MAX_DELAY = 30
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+logger = logging.getLogger(__name__)
+
+
+class JobOutcome(NamedTuple):
+    """Итог обработки одного ID: статус из parsers/ledger.py и результат для done"""
+    job_id: int
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def set_base_url(base_url: str):
+    """Направляет парсер на другой API вакансий, например parsers/mock_api.py"""
+    global JOBS_API_BASE_URL, JOBS_API_URL
+    JOBS_API_BASE_URL = base_url
+    JOBS_API_URL = base_url.rstrip('/') + "/api/jobs/{job_id}"
+    # Процессы, запущенные через spawn, заново читают адрес из окружения
+    os.environ["JOBS_API_BASE_URL"] = base_url
+
+
+def make_http_session(pool_size: int = 10) -> requests.Session:
+    """Создает сессию requests с настройками повторных попыток.
+
+    ``pool_size`` — сколько keep-alive соединений к одному хосту держит сессия;
+    должно быть не меньше числа потоков, которые пользуются ею одновременно.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+# Сессии потоков: у каждого потока (и процесса) своя, соединения живут между вакансиями
+_local = threading.local()
+_sessions: List[Tuple[int, requests.Session]] = []
+_sessions_lock = threading.Lock()
+_generation = 0
+
+
+def get_http_session() -> requests.Session:
+    """Сессия текущего потока; создаётся при первом вызове в потоке"""
+    # После fork дочерний процесс не должен пользоваться соединениями родителя,
+    # а после close_http_sessions поток получает новую сессию
+    key = (os.getpid(), _generation)
+    if getattr(_local, 'key', None) != key:
+        # Поток работает с сессией последовательно, ему хватит одного соединения
+        _local.session, _local.key = make_http_session(pool_size=1), key
+        with _sessions_lock:
+            _sessions.append((os.getpid(), _local.session))
+    return _local.session
+
+
+def http_stats() -> Dict[str, int]:
+    """Запросы и новые TCP/TLS соединения по сессиям потоков этого процесса"""
+    stats = {'sessions': 0, 'requests': 0, 'connections': 0}
+    with _sessions_lock:
+        sessions = [session for pid, session in _sessions if pid == os.getpid()]
+    for session in sessions:
+        stats['sessions'] += 1
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool in filter(None, map(pools.get, pools.keys())):
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+    return stats
+
+
+def close_http_sessions() -> Dict[str, int]:
+    """Закрывает сессии потоков этого процесса и возвращает их http_stats"""
+    global _generation
+    stats = http_stats()
+    with _sessions_lock:
+        _generation += 1
+        closing = [session for pid, session in _sessions if pid == os.getpid()]
+        _sessions[:] = [(pid, session) for pid, session in _sessions if pid != os.getpid()]
+    for session in closing:
+        session.close()
+    return stats
+
+
+def make_async_http_session(limit_per_host: int = 10) -> aiohttp.ClientSession:
+    """Создает асинхронную HTTP сессию"""
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(limit_per_host=limit_per_host),
+        headers={'User-Agent': USER_AGENT},
+    )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах: число секунд или HTTP-дата"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryingHttpSession:
+    """aiohttp-сессия с повторами и, если задан ``limiter``, AIMD-параллелизмом.
+
+    ``get`` используется так же, как у aiohttp.ClientSession. На 429/5xx и
+    обрыв соединения запрос повторяется до ``attempts`` раз с паузой
+    uniform(0, base_delay * 2**n) (full jitter), а если сервер прислал
+    Retry-After — не раньше указанного срока. Ответы 429/503 снижают лимит
+    параллелизма, успешные — повышают.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, limiter: Optional[AdaptiveLimiter] = None,
+                 attempts: int = ASYNC_RETRY_ATTEMPTS, base_delay: float = ASYNC_RETRY_BASE_DELAY,
+                 max_delay: float = ASYNC_RETRY_MAX_DELAY):
+        self.session = session
+        self.limiter = limiter
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        jitter = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return (retry_after or 0) + jitter
+
+    @contextlib.asynccontextmanager
+    async def get(self, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        attempt = 0
+        while True:
+            attempt += 1
+            epoch = await self.limiter.acquire() if self.limiter else 0
+            response, error, retry_after = None, None, None
+            try:
+                response = await self.session.get(url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            throttled = response is not None and response.status in THROTTLE_STATUSES
+            if response is not None and response.status in RETRY_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            retry = attempt < self.attempts and (error is not None or response.status in RETRY_STATUSES)
+            if not retry:
+                try:
+                    if error is not None:
+                        raise error
+                    yield response
+                finally:
+                    if response is not None:
+                        response.release()
+                    if self.limiter:
+                        await self.limiter.release(epoch, throttled, retry_after, failed=error is not None)
+                return
+            if response is not None:
+                response.release()
+            if self.limiter:
+                await self.limiter.release(epoch, throttled, retry_after, failed=error is not None)
+            self.retries += 1
+            await asyncio.sleep(self._delay(attempt, retry_after))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.limiter.stats() if self.limiter else {}
+        return {**stats, "retries": self.retries}
+
+
+def _job_from_entry(job_id: int, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if entry['status'] == 404:
+        logger.info("Вакансия с ID %s не найдена", job_id, extra={"sample": "not_found"})
+        return None
+    return entry['body']
+
+
+def fetch_job(http_session: requests.Session, job_id: int,
+              cache: Optional[ResponseCache] = None) -> Optional[Dict[str, Any]]:
+    """Загружает вакансию (или берёт из ``cache``); None, если её нет"""
+    url = JOBS_API_URL.format(job_id=job_id)
+    if cache is None:
+        with stage("fetch"):
+            response = http_session.get(url, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 404:
+            logger.info("Вакансия с ID %s не найдена", job_id, extra={"sample": "not_found"})
+            return None
+        response.raise_for_status()
+        with stage("decode"):
+            return response.json()
+
+    with stage("fetch"):
+        entry = cache.lookup(url)
+        if entry is not None and cache.is_fresh(entry):
+            return _job_from_entry(job_id, cache.hit(entry))
+        response = http_session.get(url, timeout=REQUEST_TIMEOUT, headers=cache.revalidation_headers(entry))
+    if response.status_code == 304 and entry is not None:
+        return _job_from_entry(job_id, cache.revalidated(url, entry))
+    if response.status_code != 404:
+        response.raise_for_status()
+    with stage("decode"):
+        body = response.json() if response.status_code == 200 else None
+    return _job_from_entry(job_id, cache.store(url, response.status_code, body, response.headers))
+
+
+async def fetch_job_async(http_session: aiohttp.ClientSession, job_id: int,
+                          cache: Optional[ResponseCache] = None) -> Optional[Dict[str, Any]]:
+    url = JOBS_API_URL.format(job_id=job_id)
+    # Тело читаем внутри загрузки, а декодируем отдельно, чтобы разделить время этапов
+    if cache is None:
+        with stage("fetch"):
+            async with http_session.get(url) as response:
+                if response.status == 404:
+                    logger.info("Вакансия с ID %s не найдена", job_id, extra={"sample": "not_found"})
+                    return None
+                response.raise_for_status()
+                raw = await response.read()
+        with stage("decode"):
+            return json.loads(raw)
+
+    # Файлы кэша маленькие, читаем и пишем их прямо в event loop
+    with stage("fetch"):
+        entry = cache.lookup(url)
+        if entry is not None and cache.is_fresh(entry):
+            return _job_from_entry(job_id, cache.hit(entry))
+        async with http_session.get(url, headers=cache.revalidation_headers(entry)) as response:
+            if response.status == 304 and entry is not None:
+                return _job_from_entry(job_id, cache.revalidated(url, entry))
+            if response.status != 404:
+                response.raise_for_status()
+            status, headers = response.status, response.headers
+            raw = await response.read() if status == 200 else None
+    with stage("decode"):
+        body = json.loads(raw) if raw is not None else None
+    return _job_from_entry(job_id, cache.store(url, status, body, headers))
+
+
+def parse_job_data(job_id: int, job_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Извлекает навыки из загруженной вакансии; None для неактивных"""
+    if not job_data.get('active', False):
+        logger.info("Вакансия с ID %s не активна", job_id, extra={"sample": "inactive"})
+        return None
+    return {
+        'job_id': job_id,
+        'title': job_data.get('title', ''),
+        'company': job_data.get('company_name', ''),
+        'skills': extract_skills_from_job(job_data),
+    }
+
+
+def init_parse_process(log_config, timed: bool):
+    """Настройка процесса, в котором parse_job_batch разбирает пачки (режим hybrid)"""
+    init_worker_logging(log_config)
+    if timed:
+        enable_stage_timings()
+
+
+def parse_job_batch(batch: List[Tuple[int, Dict[str, Any]]]) -> List[JobOutcome]:
+    """parse_job_data для пачки вакансий; выполняется в пуле процессов"""
+    outcomes = []
+    for job_id, job_data in batch:
+        try:
+            result = parse_job_data(job_id, job_data)
+        except Exception as e:
+            logger.warning("Ошибка при парсинге вакансии %s: %s", job_id, e)
+            outcomes.append(JobOutcome(job_id, STATUS_ERROR, error=str(e)))
+            continue
+        if result is None:
+            outcomes.append(JobOutcome(job_id, STATUS_INACTIVE))
+        else:
+            outcomes.append(JobOutcome(job_id, STATUS_DONE, result))
+    return outcomes
+
+
+def log_parsed(result: Dict[str, Any]):
+    logger.info(
+        "Обработана вакансия %s: %s в %s", result['job_id'], result['title'] or 'Без названия',
+        result['company'] or 'Неизвестная компания', extra={"sample": "parsed"},
+    )
+
+
+def parse_job(job_id: int, skill_writer, http_session: Optional[requests.Session] = None,
+              cache: Optional[ResponseCache] = None) -> JobOutcome:
+    """Полный цикл для одной вакансии в синхронном коде (потоки и процессы).
+
+    Без ``skill_writer`` навыки только извлекаются, в БД они не пишутся.
+    """
+    try:
+        job_data = fetch_job(http_session or get_http_session(), job_id, cache)
+        if job_data is None:
+            return JobOutcome(job_id, STATUS_NOT_FOUND)
+        result = parse_job_data(job_id, job_data)
+        if result is None:
+            return JobOutcome(job_id, STATUS_INACTIVE)
+        if skill_writer is not None:
+            skill_writer.add(result['skills'])
+        log_parsed(result)
+        return JobOutcome(job_id, STATUS_DONE, result)
+    except Exception as e:
+        logger.warning("Ошибка при парсинге вакансии %s: %s", job_id, e)
+        return JobOutcome(job_id, STATUS_ERROR, error=str(e))
+
+
+async def parse_job_async(http_session: aiohttp.ClientSession, job_id: int, skill_writer,
+                          cache: Optional[ResponseCache] = None) -> JobOutcome:
+    """Полный цикл для одной вакансии в asyncio"""
+    try:
+        job_data = await fetch_job_async(http_session, job_id, cache)
+        if job_data is None:
+            return JobOutcome(job_id, STATUS_NOT_FOUND)
+        result = parse_job_data(job_id, job_data)
+        if result is None:
+            return JobOutcome(job_id, STATUS_INACTIVE)
+        if skill_writer is not None:
+            await skill_writer.add(result['skills'])
+        log_parsed(result)
+        return JobOutcome(job_id, STATUS_DONE, result)
+    except Exception as e:
+        logger.warning("Ошибка при парсинге вакансии %s: %s", job_id, e)
+        return JobOutcome(job_id, STATUS_ERROR, error=str(e))
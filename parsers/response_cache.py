@@ -0,0 +1,122 @@
+"""Дисковый кэш ответов API вакансий.
+
+Ответ хранится в сжатом gzip JSON-файле, имя которого — sha256 от URL
+(``<каталог>/ab/abcdef....json.gz``). Кэшируются 200 и 404. Свежая запись
+(моложе ``max_age``) отдаётся без запроса к API. Для устаревшей запись
+перепроверяется условным запросом с If-None-Match / If-Modified-Since: на
+304 берём тело из кэша и продлеваем срок. Так повторные прогоны и смена
+извлечения навыков упираются в CPU, а не в сеть.
+
+Файл записывается во временный и переименовывается, поэтому кэшем можно
+одновременно пользоваться из потоков и процессов.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", ".cache/jobs")
+RESPONSE_CACHE_MAX_AGE = float(os.getenv("RESPONSE_CACHE_MAX_AGE", "86400"))
+CACHEABLE_STATUSES = (200, 404)
+
+
+class ResponseCache:
+    """Кэш ответов в каталоге ``directory``; ``max_age`` — срок свежести в секундах"""
+
+    def __init__(self, directory: str = RESPONSE_CACHE_DIR, max_age: float = RESPONSE_CACHE_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        self._counters = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json.gz")
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Запись для URL или None; битый файл считается промахом"""
+        try:
+            with gzip.open(self._path(url), "rt", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["fetched_at"] < self.max_age
+
+    def hit(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Свежая запись отдаётся без запроса к API"""
+        self._count("hits")
+        return entry
+
+    @staticmethod
+    def revalidation_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, url: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Ответ 304: запись снова свежая"""
+        self._count("revalidated")
+        entry = dict(entry, fetched_at=time.time())
+        self._write(url, entry)
+        return entry
+
+    def store(self, url: str, status: int, body: Any, headers: Mapping[str, str]) -> Dict[str, Any]:
+        self._count("misses")
+        entry = {
+            "url": url,
+            "status": status,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": body,
+        }
+        if status in CACHEABLE_STATUSES:
+            self._write(url, entry)
+        return entry
+
+    def _write(self, url: str, entry: Dict[str, Any]):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as file:
+                file.write(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def __getstate__(self):
+        # В процесс передаём настройки, счётчики у каждого процесса свои
+        return {"directory": self.directory, "max_age": self.max_age}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def format_cache_stats(stats: Dict[str, int]) -> str:
+    return (
+        f"кэш ответов API: {stats['hits']} из кэша, {stats['revalidated']} подтверждено (304), "
+        f"{stats['misses']} загружено"
+    )
@@ -0,0 +1,179 @@
+"""Кэш уже известных навыков для парсеров вакансий.
+
+Словарь навыков небольшой и быстро перестаёт расти, поэтому почти все
+найденные навыки уже есть в БД. Кэш загружается из таблицы skill при
+старте и пропускает к SkillWriter только новые навыки; повторно
+встреченные в БД не отправляются совсем.
+
+- KnownSkills — для потоков одного процесса;
+- SharedKnownSkills — общий для процессов словарь через multiprocessing.Manager;
+- AsyncKnownSkills — для парсеров на asyncio (без блокировок: весь код
+  выполняется в одном event loop между await).
+"""
+import os
+import threading
+from typing import Dict, Iterable, List
+
+from sqlalchemy import func, select
+
+from models import Skill
+from parsers.skill_store import normalize_skill_name
+
+
+def load_known_skills(engine) -> List[str]:
+    """Ключи всех навыков из БД"""
+    with engine.connect() as connection:
+        return list(connection.execute(select(func.lower(Skill.name))).scalars())
+
+
+async def load_known_skills_async(session_factory) -> List[str]:
+    async with session_factory() as session:
+        result = await session.execute(select(func.lower(Skill.name)))
+        return list(result.scalars())
+
+
+def _stats(hits: int, misses: int, size: int) -> Dict:
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+        "size": size,
+    }
+
+
+def format_stats(stats: Dict) -> str:
+    return (
+        f"кэш навыков: {stats['hits']} попаданий, {stats['misses']} новых, "
+        f"hit rate {stats['hit_rate']:.1%}, известно навыков {stats['size']}"
+    )
+
+
+class KnownSkills:
+    """Потокобезопасное множество известных навыков"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._keys = {normalize_skill_name(name) for name in names}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def filter_new(self, skills: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Возвращает ещё не известные навыки и сразу помечает их известными.
+
+        Если один и тот же навык одновременно встретят два потока, в БД его
+        отправит только первый.
+        """
+        new_skills = []
+        with self._lock:
+            for skill in skills:
+                key = normalize_skill_name(skill["name"])
+                if key in self._keys:
+                    self.hits += 1
+                else:
+                    self._keys.add(key)
+                    self.misses += 1
+                    new_skills.append(skill)
+        return new_skills
+
+    def forget(self, skills: Iterable[Dict[str, str]]):
+        """Снимает отметку с навыков, которые не удалось записать в БД"""
+        with self._lock:
+            for skill in skills:
+                self._keys.discard(normalize_skill_name(skill["name"]))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return _stats(self.hits, self.misses, len(self._keys))
+
+
+class SharedKnownSkills:
+    """Кэш навыков, общий для процессов.
+
+    Общий словарь живёт в процессе multiprocessing.Manager, каждое обращение
+    к нему — межпроцессный вызов. Поэтому перед ним стоит локальное множество
+    процесса: навык, однажды встреченный этим процессом, больше не требует
+    обращения к менеджеру. Объект передаётся в дочерние процессы аргументом.
+    """
+
+    def __init__(self, shared_keys, shared_stats):
+        self._shared = shared_keys
+        self._shared_stats = shared_stats
+        self._local = set()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def create(cls, manager, names: Iterable[str] = ()) -> "SharedKnownSkills":
+        shared_keys = manager.dict({normalize_skill_name(name): None for name in names})
+        return cls(shared_keys, manager.dict())
+
+    def __getstate__(self):
+        # В дочерний процесс уходят только прокси общих словарей
+        return {"_shared": self._shared, "_shared_stats": self._shared_stats}
+
+    def __setstate__(self, state):
+        self.__init__(state["_shared"], state["_shared_stats"])
+
+    def filter_new(self, skills: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        new_skills = []
+        token = (os.getpid(), threading.get_ident())
+        for skill in skills:
+            key = normalize_skill_name(skill["name"])
+            if key in self._local:
+                self.hits += 1
+                continue
+            self._local.add(key)
+            # setdefault атомарен в процессе менеджера: навык забирает тот, чьё значение записалось
+            if self._shared.setdefault(key, token) == token:
+                self.misses += 1
+                new_skills.append(skill)
+            else:
+                self.hits += 1
+        return new_skills
+
+    def forget(self, skills: Iterable[Dict[str, str]]):
+        """Снимает отметку и в общем словаре: навык смогут записать другие процессы"""
+        for skill in skills:
+            key = normalize_skill_name(skill["name"])
+            self._local.discard(key)
+            self._shared.pop(key, None)
+
+    def publish_stats(self):
+        """Сохраняет счётчики процесса в общий словарь для итогового отчёта"""
+        self._shared_stats[os.getpid()] = (self.hits, self.misses)
+
+    def stats(self) -> Dict:
+        """Сумма счётчиков всех процессов, вызвавших publish_stats"""
+        counters = list(self._shared_stats.values())
+        hits = sum(hits for hits, _ in counters)
+        misses = sum(misses for _, misses in counters)
+        return _stats(hits, misses, len(self._shared))
+
+
+class AsyncKnownSkills:
+    """Кэш навыков для asyncio: filter_new не содержит await и не прерывается"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._keys = {normalize_skill_name(name) for name in names}
+        self.hits = 0
+        self.misses = 0
+
+    def filter_new(self, skills: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        new_skills = []
+        for skill in skills:
+            key = normalize_skill_name(skill["name"])
+            if key in self._keys:
+                self.hits += 1
+            else:
+                self._keys.add(key)
+                self.misses += 1
+                new_skills.append(skill)
+        return new_skills
+
+    def forget(self, skills: Iterable[Dict[str, str]]):
+        for skill in skills:
+            self._keys.discard(normalize_skill_name(skill["name"]))
+
+    def stats(self) -> Dict:
+        return _stats(self.hits, self.misses, len(self._keys))
@@ -0,0 +1,157 @@
+"""Извлечение навыков из вакансий за один проход по тексту.
+
+Весь словарь технологий (parsers/data/technologies.txt) компилируется один
+раз в одно регулярное выражение. Альтернативы собраны в префиксное дерево,
+поэтому движку регулярных выражений не нужно перебирать тысячи вариантов в
+каждой позиции текста: стоимость прохода почти не зависит от размера словаря.
+Найденные совпадения приводятся к каноническому имени из словаря.
+"""
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from parsers.html_text import html_to_text
+from parsers.stage_timings import stage
+
+TECHNOLOGIES_PATH = os.path.join(os.path.dirname(__file__), "data", "technologies.txt")
+
+# Списки технологий после "стек:", "технологии:", "требования:" и т.д.
+STACK_PATTERN = re.compile(
+    r'(?:стек|технологии|требования|навыки|опыт работы с|знание)(?:[:\s]+)([^\.]+)', re.IGNORECASE
+)
+STACK_SEPARATOR = re.compile(r'[,;\s]+')
+STOP_WORDS = {'и', 'или', 'the', 'a', 'an', 'от', 'до', 'лет', 'года'}
+
+# Граница слова для терминов вида C#, C++, .NET, Node.js: \b для них не подходит
+_LEFT_BOUNDARY = r'(?<![\w])'
+_RIGHT_BOUNDARY = r'(?![\w#+])'
+
+
+def _term_key(term: str) -> str:
+    return re.sub(r'\s+', ' ', term).strip().lower()
+
+
+def load_vocabulary(path: str = TECHNOLOGIES_PATH) -> Dict[str, str]:
+    """Читает словарь: ключ термина (в нижнем регистре) -> каноническое имя"""
+    vocabulary = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [name.strip() for name in line.split("|") if name.strip()]
+            for name in names:
+                vocabulary.setdefault(_term_key(name), names[0])
+    return vocabulary
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Собирает альтернативу из терминов по префиксному дереву.
+
+    Хвост, после которого термин может закончиться, делается жадно
+    необязательным, поэтому всегда выигрывает самое длинное совпадение
+    (ASP.NET, а не ASP).
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [
+            (r'\s+' if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            if len(branches) == 1:
+                pattern = "(?:" + pattern + ")"
+            pattern += "?"
+        return pattern
+
+    return build(trie)
+
+
+class SkillExtractor:
+    """Поиск технологий из словаря в тексте одним скомпилированным выражением"""
+
+    def __init__(self, vocabulary: Dict[str, str]):
+        self.vocabulary = vocabulary
+        self.pattern = re.compile(
+            _LEFT_BOUNDARY + "(?:" + _trie_pattern(vocabulary) + ")" + _RIGHT_BOUNDARY,
+            re.IGNORECASE,
+        )
+
+    @classmethod
+    def from_file(cls, path: str = TECHNOLOGIES_PATH) -> "SkillExtractor":
+        return cls(load_vocabulary(path))
+
+    def find_technologies(self, text: str) -> List[str]:
+        """Канонические имена найденных технологий в порядке первого упоминания"""
+        found = {}
+        for match in self.pattern.finditer(text):
+            name = self.vocabulary[_term_key(match.group())]
+            found.setdefault(name, None)
+        return list(found)
+
+    def extract(self, job_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Извлекает навыки из данных о вакансии"""
+        skills = []
+
+        # Специальность как основной навык
+        if job_data.get('speciality'):
+            skills.append({
+                'name': job_data['speciality'].upper(),
+                'category': 'Programming Language',
+                'description': f"Programming language or technology: {job_data['speciality']}"
+            })
+
+        description = job_data.get('description', '')
+        if description:
+            with stage("strip"):
+                text = html_to_text(description)
+
+            with stage("extract"):
+                for match in STACK_PATTERN.findall(text):
+                    for tech in STACK_SEPARATOR.split(match):
+                        tech = tech.strip()
+                        if tech and len(tech) > 1 and tech.lower() not in STOP_WORDS:
+                            skills.append({
+                                'name': tech,
+                                'category': 'Technology',
+                                'description': f"Technology or skill mentioned in job description: {tech}"
+                            })
+
+                for name in self.find_technologies(text):
+                    skills.append({
+                        'name': name,
+                        'category': 'Technology',
+                        'description': f"Technology or skill mentioned in job description: {name}"
+                    })
+
+        # Удаляем дубликаты (по имени, регистронезависимо)
+        unique_skills = {}
+        for skill in skills:
+            unique_skills.setdefault(skill['name'].lower(), skill)
+        return list(unique_skills.values())
+
+
+_default_extractor: Optional[SkillExtractor] = None
+
+
+def get_extractor() -> SkillExtractor:
+    """Общий экземпляр со словарём по умолчанию; компилируется при первом вызове"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor.from_file()
+    return _default_extractor
+
+
+def extract_skills_from_job(job_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Извлекает навыки из данных о вакансии словарём по умолчанию"""
+    return get_extractor().extract(job_data)
@@ -0,0 +1,177 @@
+"""Пакетное сохранение навыков, найденных парсерами вакансий.
+
+Вместо SELECT ... ILIKE и отдельного коммита на каждый навык навыки
+копятся в буфере и записываются одним INSERT ... ON CONFLICT DO NOTHING
+на пачку. Ключ уникальности — lower(name), для него в БД есть уникальный
+индекс ix_skill_name_lower.
+"""
+import asyncio
+import re
+import threading
+from typing import Dict, Iterable, List
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from models import Skill
+from parsers.stage_timings import stage
+
+SKILL_BATCH_SIZE = 500
+
+
+def clean_skill_name(name: str) -> str:
+    """Имя навыка для записи: пробелы схлопнуты, по краям обрезаны"""
+    return re.sub(r"\s+", " ", name).strip()
+
+
+def normalize_skill_name(name: str) -> str:
+    """Ключ навыка: без лишних пробелов и без учёта регистра"""
+    return clean_skill_name(name).lower()
+
+
+def skill_rows(skills: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Строки для таблицы skill: без пустых имён и повторов внутри пачки.
+
+    Имя сохраняется в том виде, в котором встретилось первым.
+    """
+    rows = {}
+    for skill in skills:
+        key = normalize_skill_name(skill["name"])
+        if key and key not in rows:
+            rows[key] = {
+                "name": clean_skill_name(skill["name"]),
+                "description": skill.get("description", ""),
+            }
+    return list(rows.values())
+
+
+def _insert_for(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise ValueError(
+        f"Пакетная запись навыков не поддерживает СУБД {dialect_name!r}: нужен INSERT ... ON CONFLICT "
+        "(postgresql или sqlite)"
+    )
+
+
+def build_upsert(dialect_name: str, skills: Iterable[Dict[str, str]]):
+    """Строит INSERT ... ON CONFLICT DO NOTHING RETURNING name для пачки навыков (см. ``skill_rows``)"""
+    rows = skill_rows(skills)
+    if not rows:
+        return None
+    insert = _insert_for(dialect_name)
+    return (
+        insert(Skill)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[func.lower(Skill.name)])
+        .returning(Skill.name)
+    )
+
+
+class SkillWriter:
+    """Буфер навыков для синхронных парсеров (потоки и процессы).
+
+    Буфер общий для потоков процесса; запись идёт, когда набирается
+    ``batch_size`` навыков, и при вызове ``flush``. Записи идут по одной:
+    ``flush`` возвращается, только когда в БД всё, что было добавлено до
+    него, в том числе пачка, которую в этот момент пишет другой поток. Если
+    задан ``known_skills`` (см. parsers/skill_cache.py), уже известные
+    навыки в буфер не попадают.
+
+    Если запись не удалась, ``flush`` поднимает исключение, пачка
+    возвращается в начало буфера, а её навыки перестают считаться
+    известными: навыки не теряются, и их запишет следующая удачная запись.
+    """
+
+    def __init__(self, engine, batch_size: int = SKILL_BATCH_SIZE, known_skills=None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.known_skills = known_skills
+        self.inserted: List[str] = []
+        self.batches = 0
+        self._buffer: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def add(self, skills: Iterable[Dict[str, str]]):
+        if self.known_skills is not None:
+            skills = self.known_skills.filter_new(skills)
+        with self._lock:
+            self._buffer.extend(skills)
+            if len(self._buffer) < self.batch_size:
+                return
+        self.flush()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            try:
+                self._write(batch)
+            except BaseException:
+                with self._lock:
+                    self._buffer[:0] = batch
+                if self.known_skills is not None:
+                    self.known_skills.forget(batch)
+                raise
+
+    def _write(self, batch: List[Dict[str, str]]):
+        statement = build_upsert(self.engine.dialect.name, batch)
+        if statement is None:
+            return
+        # Этап persist замеряется на пачку: add только дописывает в буфер
+        with stage("persist"), Session(self.engine) as session:
+            names = session.exec(statement).scalars().all()
+            session.commit()
+        with self._lock:
+            self.inserted.extend(names)
+            self.batches += 1
+
+
+class AsyncSkillWriter:
+    """Буфер навыков для asyncio-парсеров на async_session_factory.
+
+    Как и у SkillWriter, записи идут по одной: ``flush`` дожидается пачки,
+    которую начала писать другая задача, а неудачная пачка возвращается в
+    буфер.
+    """
+
+    def __init__(self, session_factory, batch_size: int = SKILL_BATCH_SIZE, known_skills=None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.known_skills = known_skills
+        self.inserted: List[str] = []
+        self.batches = 0
+        self._buffer: List[Dict[str, str]] = []
+        self._flush_lock = asyncio.Lock()
+
+    async def add(self, skills: Iterable[Dict[str, str]]):
+        if self.known_skills is not None:
+            skills = self.known_skills.filter_new(skills)
+        self._buffer.extend(skills)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            # Буфер забираем до await: пока идёт запись, другие задачи копят новую пачку
+            batch, self._buffer = self._buffer, []
+            try:
+                async with self.session_factory() as session:
+                    statement = build_upsert(session.bind.dialect.name, batch)
+                    if statement is None:
+                        return
+                    with stage("persist"):
+                        result = await session.execute(statement)
+                        names = result.scalars().all()
+                        await session.commit()
+            except BaseException:
+                self._buffer[:0] = batch
+                if self.known_skills is not None:
+                    self.known_skills.forget(batch)
+                raise
+            self.inserted.extend(names)
+            self.batches += 1
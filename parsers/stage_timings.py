@@ -0,0 +1,206 @@
+"""Время этапов обработки вакансий: загрузка, декодирование JSON, очистка HTML,
+поиск навыков, запись в БД.
+
+Итоговое время прогона не показывает, во что упирается парсер: в сеть, в
+разбор HTML, в регулярные выражения или в БД. Если регистратор включён
+(``enable``), каждый этап каждой вакансии, обёрнутый в ``stage``, попадает в
+логарифмическую гистограмму своего этапа; запись в БД замеряется на пачку
+навыков (parsers/skill_store.py). Память не зависит от числа
+вакансий, а гистограммы из разных процессов складываются. Выключенный
+``stage`` почти ничего не стоит, поэтому разметка этапов остаётся в коде
+всегда.
+
+    python -m parsers --mode hybrid --timings-json timings.json
+"""
+import contextlib
+import json
+import math
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+STAGES = ("fetch", "decode", "strip", "extract", "persist")
+STAGE_TITLES = {
+    "fetch": "загрузка",
+    "decode": "разбор JSON",
+    "strip": "очистка HTML",
+    "extract": "поиск навыков",
+    "persist": "запись в БД",
+}
+PERCENTILES = (50, 95, 99)
+
+# Корзины от 1 мкс, каждая следующая шире предыдущей на 2**(1/8) (~9%)
+_MIN_SECONDS = 1e-6
+_BUCKET_RATIO = 2 ** (1 / 8)
+
+
+class Histogram:
+    """Гистограмма длительностей с точностью ~9%"""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket(seconds: float) -> int:
+        if seconds <= _MIN_SECONDS:
+            return 0
+        return int(math.log(seconds / _MIN_SECONDS, _BUCKET_RATIO)) + 1
+
+    @staticmethod
+    def upper_bound(bucket: int) -> float:
+        return _MIN_SECONDS * _BUCKET_RATIO ** bucket
+
+    def add(self, seconds: float):
+        bucket = self._bucket(seconds)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "Histogram"):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Верхняя граница корзины, в которую попал перцентиль (не больше максимума)"""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+
+class StageTimings:
+    """Гистограммы по этапам; ``record`` можно вызывать из разных потоков"""
+
+    def __init__(self):
+        self.histograms = {stage: Histogram() for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.histograms[stage].add(seconds)
+
+    def merge(self, other: "StageTimings"):
+        with self._lock:
+            for stage, histogram in other.histograms.items():
+                self.histograms[stage].merge(histogram)
+
+    def drain(self) -> "StageTimings":
+        """Забирает накопленное и начинает заново: так процесс отдаёт прирост за пачку"""
+        drained = StageTimings()
+        with self._lock:
+            drained.histograms, self.histograms = self.histograms, drained.histograms
+        return drained
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        """Для этапов, которые встречались: число, время, перцентили в мс и частота за прогон"""
+        summary = {}
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                if not histogram.count:
+                    continue
+                summary[stage] = {
+                    "count": histogram.count,
+                    "total": round(histogram.total, 4),
+                    "mean_ms": round(histogram.total / histogram.count * 1000, 3),
+                    **{f"p{p}_ms": round(histogram.percentile(p) * 1000, 3) for p in PERCENTILES},
+                    "max_ms": round(histogram.max * 1000, 3),
+                    "per_second": round(histogram.count / elapsed, 1) if elapsed else 0.0,
+                }
+        return summary
+
+    def buckets(self) -> Dict[str, List[List[float]]]:
+        """Гистограммы для графиков: [верхняя граница корзины в мс, число] по этапам"""
+        with self._lock:
+            return {
+                stage: [
+                    [round(Histogram.upper_bound(bucket) * 1000, 4), count]
+                    for bucket, count in sorted(histogram.counts.items())
+                ]
+                for stage, histogram in self.histograms.items()
+                if histogram.count
+            }
+
+    def __getstate__(self):
+        return {"histograms": self.histograms}
+
+    def __setstate__(self, state):
+        self.histograms = state["histograms"]
+        self._lock = threading.Lock()
+
+
+_recorder: Optional[StageTimings] = None
+
+
+def enable() -> StageTimings:
+    """Включает замеры в этом процессе с чистого листа"""
+    global _recorder
+    _recorder = StageTimings()
+    return _recorder
+
+
+def disable():
+    global _recorder
+    _recorder = None
+
+
+def current() -> Optional[StageTimings]:
+    return _recorder
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Замеряет вложенный блок как этап ``name``; без ``enable`` ничего не делает"""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record(name, time.perf_counter() - start_time)
+
+
+def call_and_drain(func, *args):
+    """Вызывает ``func`` в процессе пула и возвращает (результат, замеры за вызов или None)"""
+    result = func(*args)
+    return result, _recorder.drain() if _recorder is not None else None
+
+
+def format_stages(summary: Dict[str, Dict[str, float]]) -> str:
+    lines = ["Этапы (p50 / p95 / p99):"]
+    for name, stats in summary.items():
+        percentiles = " / ".join(f"{stats[f'p{p}_ms']:.2f}" for p in PERCENTILES)
+        lines.append(
+            f"  {STAGE_TITLES[name]}: {stats['count']} раз, {percentiles} мс, "
+            f"всего {stats['total']:.2f} с, {stats['per_second']:.1f} в секунду"
+        )
+    return "\n".join(lines)
+
+
+def run_data(report: Dict[str, Any], recorder: StageTimings) -> Dict[str, Any]:
+    """Сводка и гистограммы этапов прогона для JSON"""
+    return {
+        "mode": report["mode"],
+        "jobs": report["jobs"],
+        "elapsed": report["elapsed"],
+        "stages": report["stages"],
+        "histograms": recorder.buckets(),
+    }
+
+
+def dump_json(path: str, data: Any):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,46 @@
+"""Подсчёт SQL-запросов, которые выполняются через engine."""
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Накапливает выполненные SQL-выражения."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """Считает запросы, отправленные в БД внутри блока ``with``.
+
+    Принимает как обычный, так и асинхронный engine.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    counter = QueryCounter()
+    event.listen(sync_engine, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", counter._on_execute)
+
+
+@contextmanager
+def assert_max_queries(engine, max_queries: int):
+    """Падает с AssertionError, если внутри блока выполнено больше ``max_queries`` запросов"""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > max_queries:
+        statements = "\n".join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(
+            f"Ожидалось не больше {max_queries} запросов, выполнено {counter.count}:\n{statements}"
+        )